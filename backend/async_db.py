@@ -0,0 +1,28 @@
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from db import DATABASE_URL, SQL_ECHO, POOL_OPTIONS, STATEMENT_TIMEOUT_MS
+
+# Async driver for each backend DATABASE_URL may point at
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_url(url: str) -> URL:
+    """DATABASE_URL is shared with the sync worker; swap in the async driver."""
+    url = make_url(url)
+    return url.set(drivername=f"{url.get_backend_name()}+{ASYNC_DRIVERS[url.get_backend_name()]}")
+
+
+def _connect_args() -> dict:
+    if not STATEMENT_TIMEOUT_MS or make_url(DATABASE_URL).get_backend_name() != "postgresql":
+        return {}
+    return {"server_settings": {"statement_timeout": str(STATEMENT_TIMEOUT_MS)}}
+
+
+async_engine = create_async_engine(async_url(DATABASE_URL), echo=SQL_ECHO, connect_args=_connect_args(), **POOL_OPTIONS)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -0,0 +1,43 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from models import DataVersion
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    # The worker imports this module too and doesn't install the asyncio extra
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+DATA_VERSION_ID = 1
+
+
+def bump_data_version(db: Session) -> int:
+    """
+    Advance the stamp inside the caller's transaction, so readers see the new
+    version only once the data it describes is committed.
+    """
+    stmt = insert(DataVersion).values(id=DATA_VERSION_ID, version=1, updated_at=func.now())
+    return db.execute(stmt.on_conflict_do_update(
+        index_elements=[DataVersion.id],
+        set_={"version": DataVersion.version + 1, "updated_at": func.now()},
+    ).returning(DataVersion.version)).scalar_one()
+
+
+def _data_version_query():
+    return select(DataVersion.version, DataVersion.updated_at).where(DataVersion.id == DATA_VERSION_ID)
+
+
+def _as_version(row) -> Tuple[int, datetime]:
+    if row is None:
+        return 0, datetime.fromtimestamp(0, timezone.utc)
+    updated_at = row.updated_at if row.updated_at.tzinfo else row.updated_at.replace(tzinfo=timezone.utc)
+    return row.version, updated_at
+
+
+def current_data_version(db: Session) -> Tuple[int, datetime]:
+    return _as_version(db.execute(_data_version_query()).first())
+
+
+async def fetch_data_version(db: "AsyncSession") -> Tuple[int, datetime]:
+    return _as_version((await db.execute(_data_version_query())).first())
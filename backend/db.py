@@ -1,18 +1,63 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from models import Base
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from alembic import command
+from alembic.config import Config
+from typing import Optional
 import os
 
 DATABASE_URL = os.environ["DATABASE_URL"]
+ENV = os.getenv("ENV", "development")
 
-engine = create_engine(DATABASE_URL, echo=True, future=True)
+# Statement logging is for local debugging; SQL_ECHO=1 turns it on anywhere
+SQL_ECHO = os.getenv("SQL_ECHO", "1" if ENV == "development" else "0") == "1"
+
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_pre_ping": True,
+}
+
+# 0 leaves Postgres' default (no limit); the API sets one, long-running worker jobs don't
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+engine = create_engine(
+    DATABASE_URL,
+    echo=SQL_ECHO,
+    future=True,
+    connect_args={"options": f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"} if STATEMENT_TIMEOUT_MS else {},
+    **POOL_OPTIONS,
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+def _legacy_revision() -> Optional[str]:
+    """
+    Revision that a database built by create_all, before migrations existed,
+    already matches. None for empty databases and ones alembic already tracks.
+    """
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        if not inspector.has_table("speeches") or inspector.has_table("alembic_version"):
+            return None
+        constraints = {c["name"] for c in inspector.get_unique_constraints("speeches")}
+        if "uq_speech_fingerprint" not in constraints:
+            return "0001"
+        return "0003" if inspector.has_table("ingestion_log") else "0002"
+
+
 # For schema creation
 def init_db():
-    from models import Party, Speaker, Speech, SpeakerPartyAffiliation  # import all models here
-    Base.metadata.create_all(bind=engine)
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    legacy = _legacy_revision()
+    if legacy:
+        print(f"ℹ️ Adopting existing schema at migration {legacy}")
+        command.stamp(config, legacy)
+    command.upgrade(config, "head")
 
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,135 @@
+"""
+Run EXPLAIN ANALYZE on the queries behind the API against a seeded database
+and fail when one of them falls back to a sequential scan of a large table,
+or when a cursor page filters out the rows before the cursor instead of
+starting its index scan there.
+
+    DATABASE_URL=... python explain_queries.py [--min-rows 10000] [--max-removed 1000] [--verbose]
+"""
+from sqlalchemy import text, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from db import SessionLocal
+from models import Speech, Speaker, Party, SpeechStatsDaily
+from routes import build_speeches_query, build_speech_query, build_search_query, paginate, encode_cursor
+import argparse
+import json
+import sys
+
+# Tables small enough that a sequential scan is the right plan anyway
+SMALL_TABLE_ROWS = 10000
+# Keyset pages must seek to the cursor; discarded rows mean the scan started at the newest row
+CURSOR_QUERIES = ("cursor after 5000", "deep cursor")
+MAX_ROWS_REMOVED = 1000
+
+
+def compile_query(query) -> str:
+    statement = getattr(query, "statement", query)  # ORM Query or Core select
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def api_queries(db: Session, search_term: str) -> dict:
+    """The list and search queries under representative filter and paging combinations."""
+    party_id = db.query(Party.party_id).join(Party.affiliations).limit(1).scalar()
+    speaker_id = db.query(Speaker.speaker_id).join(Speaker.affiliations).limit(1).scalar()
+    newest = db.query(Speech.datestamp).order_by(Speech.datestamp.desc()).limit(1).scalar()
+
+    base = build_speeches_query()
+    deep = db.execute(base.offset(5000).limit(1)).first()
+    cursor = encode_cursor(deep.datestamp, deep.speech_id) if deep else None
+    total = db.query(func.count(Speech.speech_id)).scalar()
+    deepest = db.execute(base.offset(total * 9 // 10).limit(1)).first() if total else None
+
+    queries = {
+        "first page": paginate(base),
+        "offset 5000": paginate(base, skip=5000),
+        "party filter": paginate(build_speeches_query(party_ids=[party_id])),
+        "speaker filter": paginate(build_speeches_query(speaker_ids=[speaker_id])),
+        "from tribune": paginate(build_speeches_query(from_tribune=False)),
+    }
+    if newest:
+        queries["last sitting"] = paginate(build_speeches_query(date_from=newest, date_to=newest))
+    if cursor:
+        queries["cursor after 5000"] = paginate(base, cursor=cursor)
+        queries["speech detail"] = build_speech_query(deep.speech_id)
+    if deepest:
+        queries["deep cursor"] = paginate(base, cursor=encode_cursor(deepest.datestamp, deepest.speech_id))
+    queries["search"] = build_search_query(search_term)
+    queries["search + party filter"] = build_search_query(search_term, party_ids=[party_id])
+
+    stats = SpeechStatsDaily
+    queries["stats: party per month"] = db.query(
+        func.date_trunc("month", stats.stat_date), stats.party_id, func.sum(stats.speeches)
+    ).group_by(func.date_trunc("month", stats.stat_date), stats.party_id)
+
+    queries["filters: speakers"] = db.query(
+        Speaker.speaker_id, Speaker.speaker_name, Speaker.middle_name
+    ).order_by(Speaker.speaker_name).distinct()
+    return {name: compile_query(q) for name, q in queries.items()}
+
+
+def table_sizes(db: Session) -> dict:
+    rows = db.execute(text("SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'"))
+    return {name: int(tuples) for name, tuples in rows}
+
+
+def walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+def rows_removed(nodes: list) -> int:
+    return sum(n.get("Rows Removed by Filter", 0) * n.get("Actual Loops", 1) for n in nodes)
+
+
+def explain(db: Session, sql: str) -> dict:
+    result = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()
+    return (json.loads(result) if isinstance(result, str) else result)[0]
+
+
+def main(min_rows: int, max_removed: int, verbose: bool, search_term: str) -> int:
+    db = SessionLocal()
+    failures = 0
+    try:
+        db.execute(text("ANALYZE"))
+        sizes = table_sizes(db)
+        for name, sql in api_queries(db, search_term).items():
+            report = explain(db, sql)
+            nodes = list(walk(report["Plan"]))
+            seq_scans = [
+                n["Relation Name"] for n in nodes
+                if n["Node Type"] == "Seq Scan" and sizes.get(n["Relation Name"], 0) >= min_rows
+            ]
+            removed = rows_removed(nodes) if name in CURSOR_QUERIES else 0
+            failed = bool(seq_scans) or removed > max_removed
+            status = "❌" if failed else "✅"
+            print(f"{status} {name}: {report['Execution Time']:.1f} ms, "
+                  f"{report['Plan'].get('Shared Hit Blocks', 0) + report['Plan'].get('Shared Read Blocks', 0)} buffers"
+                  + (f" – seq scan on {', '.join(seq_scans)}" if seq_scans else "")
+                  + (f" – {removed} rows removed by filter" if removed > max_removed else ""))
+            if verbose:
+                for node in nodes:
+                    print(f"    {node['Node Type']} {node.get('Relation Name', '')} {node.get('Index Name', '')}".rstrip())
+            failures += failed
+    finally:
+        db.rollback()
+        db.close()
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE the API queries and flag sequential scans.")
+    parser.add_argument("--min-rows", type=int, default=SMALL_TABLE_ROWS,
+                        help="ignore sequential scans on tables with fewer rows than this")
+    parser.add_argument("--max-removed", type=int, default=MAX_ROWS_REMOVED,
+                        help="fail cursor pages that filter out more rows than this")
+    parser.add_argument("--verbose", action="store_true", help="print every plan node")
+    parser.add_argument("--search", default="бюджет", help="term for the full-text search queries")
+    args = parser.parse_args()
+
+    failures = main(args.min_rows, args.max_removed, args.verbose, args.search)
+    if failures:
+        print(f"❌ {failures} queries scan a large table sequentially or discard rows before their cursor.")
+        sys.exit(1)
+    print("✅ All API queries use indexes.")
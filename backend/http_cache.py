@@ -0,0 +1,100 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from urllib.parse import parse_qsl, urlencode
+from sqlalchemy.exc import SQLAlchemyError
+from async_db import AsyncSessionLocal
+from data_version import fetch_data_version
+import hashlib
+import os
+import time
+
+
+def normalized_query(query_string: bytes) -> str:
+    """Same filters in any order (or with empty values) give the same key."""
+    pairs = [(k, v) for k, v in parse_qsl(query_string.decode("latin-1"), keep_blank_values=False)]
+    return urlencode(sorted(pairs))
+
+
+def negotiated_encoding(headers: Headers) -> str:
+    # Mirrors GZipMiddleware, which compresses whenever the client accepts gzip
+    return "gzip" if "gzip" in headers.get("accept-encoding", "") else "identity"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+class ConditionalGetMiddleware:
+    """
+    Strong ETags for read-only API responses, derived from the ingestion data
+    version, the path, the normalized query string and the content coding.
+    A matching If-None-Match is answered with 304 before any query runs.
+
+    The data version is re-read at most every `version_ttl` seconds, so
+    responses can lag an ingestion commit by that long. Responses that set
+    their own ETag (e.g. /speeches/filters) are passed through untouched, as
+    are `excluded` paths (streamed downloads) and every request while the
+    data version can't be read.
+    """
+
+    def __init__(self, app: ASGIApp, prefixes: tuple = ("/speeches",), excluded: tuple = ("/speeches/export",),
+                 version_ttl: float = None):
+        self.app = app
+        self.prefixes = prefixes
+        self.excluded = excluded
+        self.version_ttl = version_ttl if version_ttl is not None else float(os.getenv("DATA_VERSION_TTL", "5"))
+        self._version = None
+        self._checked_at = 0.0
+
+    async def _data_version(self) -> int:
+        now = time.monotonic()
+        if self._version is None or now - self._checked_at >= self.version_ttl:
+            async with AsyncSessionLocal() as db:
+                self._version = (await fetch_data_version(db))[0]
+            self._checked_at = now
+        return self._version
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") \
+                or not scope["path"].startswith(self.prefixes) or scope["path"].startswith(self.excluded):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            version = await self._data_version()
+        except (SQLAlchemyError, OSError) as e:
+            # Caching is optional; let the route answer (or fail) on its own
+            print("⚠️ Data version unavailable, serving without an ETag:", e)
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        key = "|".join((
+            str(version), scope["path"], normalized_query(scope["query_string"]),
+            negotiated_encoding(request_headers),
+        ))
+        etag = f'"{hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]}"'
+        cache_headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", b"no-cache"),
+            (b"vary", b"Accept-Encoding"),
+        ]
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                if "etag" not in headers:
+                    headers["etag"] = etag
+                    headers["cache-control"] = "no-cache"
+                    if "accept-encoding" not in headers.get("vary", "").lower():
+                        headers.add_vary_header("Accept-Encoding")
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -1,13 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from sqlalchemy.exc import OperationalError
-from routes import router
-from db import engine
+from routes import router, NEXT_CURSOR_HEADER
+from async_db import async_engine
+from http_cache import ConditionalGetMiddleware
+from metrics import RequestMetricsMiddleware, instrument_engine, metrics_endpoint
 import os
 
 app = FastAPI()
 
 app.include_router(router)
+app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+instrument_engine(async_engine.sync_engine, "api")
 
 ENV = os.getenv("ENV", "development")
 
@@ -22,20 +28,28 @@ else:
         "https://parliametrics.bg",  # Replace with your real prod domain
     ]
 
+# Middleware added last runs first: CORS wraps everything (304s need its headers too),
+# then the ETag check, then compression of whatever the route produced
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MIN_SIZE", "1024")))
+app.add_middleware(ConditionalGetMiddleware, prefixes=("/speeches", "/stats"))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+# Outermost, so the latency includes every other middleware and 304s are counted too
+app.add_middleware(RequestMetricsMiddleware)
 
 # Test DB connection
 
 @app.on_event("startup")
-def test_db_connection():
+async def test_db_connection():
     try:
-        with engine.connect() as conn:
+        async with async_engine.connect() as conn:
             print("✅ Connected to database.")
-    except OperationalError as e:
+    except (OperationalError, OSError) as e:
         print("❌ Database connection failed:", e)
\ No newline at end of file
@@ -0,0 +1,112 @@
+from prometheus_client import Counter, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from db import POOL_OPTIONS
+import time
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "API request latency by route template",
+    ["method", "route", "status"],
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time, by engine and statement type",
+    ["engine", "operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERY_ERRORS = Counter("db_query_errors_total", "SQL statements that raised", ["engine"])
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "OTHER"
+
+
+def instrument_engine(engine: Engine, name: str):
+    """
+    Time every statement on `engine` (pass async_engine.sync_engine for the
+    async one) and expose its pool occupancy at scrape time.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        DB_QUERY_DURATION.labels(name, _operation(statement)).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        DB_QUERY_ERRORS.labels(name).inc()
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+
+    REGISTRY.register(PoolCollector(engine, name))
+
+
+class PoolCollector:
+    """Connection pool gauges, read from the pool when Prometheus scrapes."""
+
+    def __init__(self, engine: Engine, name: str):
+        self.engine = engine
+        self.name = name
+
+    def collect(self):
+        pool = self.engine.pool
+        # size() and friends only exist on QueuePool; NullPool/StaticPool report nothing
+        if not hasattr(pool, "checkedout"):
+            return
+        # The pool doesn't expose its overflow limit; every engine here is built from POOL_OPTIONS
+        capacity = pool.size() + max(POOL_OPTIONS["max_overflow"], 0)
+        families = {
+            "db_pool_checked_out": ("Connections currently lent to requests", pool.checkedout()),
+            "db_pool_idle": ("Open connections waiting in the pool", pool.checkedin()),
+            # overflow() counts down from -pool_size until the pool is full
+            "db_pool_overflow": ("Open connections beyond pool_size", max(pool.overflow(), 0)),
+            "db_pool_capacity": ("pool_size + max_overflow", capacity),
+            "db_pool_saturation": ("Share of the pool capacity in use", pool.checkedout() / capacity if capacity else 0),
+        }
+        for metric, (doc, value) in families.items():
+            family = GaugeMetricFamily(metric, doc, labels=["engine"])
+            family.add_metric([self.name], value)
+            yield family
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the latency of every HTTP request under its route template
+    (/speeches/{speech_id}, not the concrete path) so label cardinality stays fixed.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - started)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
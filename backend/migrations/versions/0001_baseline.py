@@ -0,0 +1,59 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-07-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "speakers",
+        sa.Column("speaker_id", sa.Integer(), primary_key=True),
+        sa.Column("speaker_name", sa.String(), nullable=False),
+        sa.Column("first_name", sa.String(), nullable=False),
+        sa.Column("middle_name", sa.String(), nullable=False),
+        sa.Column("last_name", sa.String(), nullable=False),
+        sa.UniqueConstraint("speaker_name", "first_name", "middle_name", "last_name", name="uq_full_speaker_name"),
+    )
+    op.create_table(
+        "parties",
+        sa.Column("party_id", sa.Integer(), primary_key=True),
+        sa.Column("party_name", sa.String(), unique=True),
+        sa.Column("party_abbreviation", sa.String()),
+        sa.Column("party_api_id", sa.String()),
+    )
+    op.create_table(
+        "affiliations",
+        sa.Column("affiliation_id", sa.Integer(), primary_key=True),
+        sa.Column("speaker_speaker_id", sa.Integer(), sa.ForeignKey("speakers.speaker_id")),
+        sa.Column("party_party_id", sa.Integer(), sa.ForeignKey("parties.party_id")),
+        sa.Column("start_date", sa.Date()),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.UniqueConstraint("speaker_speaker_id", "party_party_id", name="uq_speaker_party"),
+    )
+    op.create_table(
+        "speeches",
+        sa.Column("speech_id", sa.Integer(), primary_key=True),
+        sa.Column("speech_content", sa.Text()),
+        sa.Column("from_tribune", sa.Boolean()),
+        sa.Column("datestamp", sa.Date()),
+        sa.Column("processed", sa.Boolean()),
+        sa.Column("is_continuation", sa.Boolean()),
+        sa.Column("affiliation_id", sa.Integer(), sa.ForeignKey("affiliations.affiliation_id")),
+    )
+
+
+def downgrade():
+    op.drop_table("speeches")
+    op.drop_table("affiliations")
+    op.drop_table("parties")
+    op.drop_table("speakers")
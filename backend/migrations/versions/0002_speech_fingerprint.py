@@ -0,0 +1,102 @@
+"""speech fingerprints and duplicate guard
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-07-08 00:00:00
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from models import speech_fingerprint
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+CHUNK_SIZE = 5000
+# Duplicate groups quoted in the error message when the constraint can't be added
+REPORTED_COLLISIONS = 20
+
+
+def backfill_fingerprints(conn):
+    """
+    Hash the rows in keyset-ordered chunks, each committed on its own (the
+    caller runs this in an autocommit block), so no transaction holds row
+    locks on the whole live table and an interrupted backfill resumes
+    where it stopped.
+    """
+    select_chunk = sa.text(
+        "SELECT speech_id, speech_content FROM speeches "
+        "WHERE content_hash IS NULL AND speech_id > :last_id "
+        "ORDER BY speech_id LIMIT :limit"
+    )
+    # One statement per chunk: in autocommit mode an executemany would commit every row
+    update_chunk = sa.text(
+        "UPDATE speeches SET content_hash = v.content_hash "
+        "FROM unnest(:ids, :hashes) AS v(speech_id, content_hash) "
+        "WHERE speeches.speech_id = v.speech_id"
+    ).bindparams(
+        sa.bindparam("ids", type_=postgresql.ARRAY(sa.Integer)),
+        sa.bindparam("hashes", type_=postgresql.ARRAY(sa.String)),
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(select_chunk, {"last_id": last_id, "limit": CHUNK_SIZE}).all()
+        if not rows:
+            break
+        conn.execute(update_chunk, {
+            "ids": [speech_id for speech_id, _ in rows],
+            "hashes": [speech_fingerprint(content) for _, content in rows],
+        })
+        last_id = rows[-1][0]
+
+
+def check_collisions(conn):
+    """
+    Normalization can fold near-identical rows onto one fingerprint. Deleting
+    them is a data decision this migration won't take silently: stop and
+    point at the script that reports (and, when asked, removes) them.
+    """
+    groups = conn.execute(sa.text(
+        "SELECT datestamp, affiliation_id, array_agg(speech_id ORDER BY speech_id) AS ids "
+        "FROM speeches GROUP BY datestamp, affiliation_id, content_hash HAVING count(*) > 1 "
+        "ORDER BY datestamp"
+    )).all()
+    if not groups:
+        return
+    extra = sum(len(g.ids) - 1 for g in groups)
+    sample = "\n".join(
+        f"  {g.datestamp} affiliation {g.affiliation_id}: keep {g.ids[0]}, duplicates {g.ids[1:]}"
+        for g in groups[:REPORTED_COLLISIONS]
+    )
+    raise RuntimeError(
+        f"{len(groups)} speech fingerprints are shared by more than one row ({extra} rows would have to go), "
+        f"so uq_speech_fingerprint cannot be added:\n{sample}\n"
+        "Review them with worker/scripts/dedupe_speech_fingerprints.py, remove them with its --delete flag, "
+        "then run the upgrade again; the backfilled hashes are kept."
+    )
+
+
+def upgrade():
+    # IF NOT EXISTS picks up a backfill that an earlier run left half done
+    op.execute("ALTER TABLE speeches ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)")
+
+    if context.is_offline_mode():
+        raise RuntimeError("The fingerprint backfill hashes rows in Python and cannot run in --sql mode")
+
+    # Commits the ADD COLUMN, then commits every chunk on its own
+    with op.get_context().autocommit_block():
+        backfill_fingerprints(op.get_bind())
+
+    check_collisions(op.get_bind())
+    op.alter_column("speeches", "content_hash", nullable=False)
+    op.create_unique_constraint(
+        "uq_speech_fingerprint", "speeches", ["datestamp", "affiliation_id", "content_hash"]
+    )
+
+
+def downgrade():
+    op.drop_constraint("uq_speech_fingerprint", "speeches", type_="unique")
+    op.drop_column("speeches", "content_hash")
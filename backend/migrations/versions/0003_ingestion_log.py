@@ -0,0 +1,38 @@
+"""per-sitting ingestion log
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-07-15 00:00:00
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases adopted from create_all may have this table without the fingerprint
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table("ingestion_log"):
+        return
+    op.create_table(
+        "ingestion_log",
+        sa.Column("t_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("sitting_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True)),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+        sa.Column("rows_parsed", sa.Integer()),
+        sa.Column("rows_inserted", sa.Integer()),
+        sa.Column("rows_skipped", sa.Integer()),
+        sa.Column("error", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_ingestion_log_sitting_date", "ingestion_log", ["sitting_date"])
+
+
+def downgrade():
+    op.drop_table("ingestion_log")
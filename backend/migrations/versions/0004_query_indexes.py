@@ -0,0 +1,36 @@
+"""indexes for the API's filters and sort order
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-07-22 00:00:00
+"""
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# affiliations.speaker_speaker_id needs no index of its own: it leads uq_speaker_party.
+# speeches.datestamp range filters are served by the composite (datestamp, speech_id) one.
+INDEXES = {
+    "ix_speeches_datestamp_id": "speeches (datestamp DESC, speech_id)",
+    "ix_speeches_affiliation_id": "speeches (affiliation_id)",
+    "ix_affiliations_party_party_id": "affiliations (party_party_id)",
+    "ix_speakers_speaker_name": "speakers (speaker_name)",
+}
+
+
+def upgrade():
+    # CONCURRENTLY keeps the API readable while the indexes build on a live database;
+    # IF NOT EXISTS covers databases where init_db already created some of them
+    with op.get_context().autocommit_block():
+        for name, target in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,52 @@
+"""full-text search over speech content
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-07-29 00:00:00
+"""
+from alembic import op
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres ships no Bulgarian stemmer. Start from `simple` (lowercase, no stemming)
+    # and, where the server has bulgarian.dict/.affix/.stop installed in its tsearch_data
+    # directory, put an ispell dictionary in front of it for inflected forms.
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'bulgarian') THEN
+                CREATE TEXT SEARCH CONFIGURATION bulgarian (COPY = simple);
+            END IF;
+            BEGIN
+                CREATE TEXT SEARCH DICTIONARY bulgarian_ispell (
+                    TEMPLATE = ispell, DictFile = bulgarian, AffFile = bulgarian, StopWords = bulgarian
+                );
+                ALTER TEXT SEARCH CONFIGURATION bulgarian
+                    ALTER MAPPING FOR word, hword, hword_part WITH bulgarian_ispell, simple;
+            EXCEPTION WHEN config_file_error OR undefined_file OR duplicate_object THEN
+                RAISE NOTICE 'Bulgarian ispell dictionary not installed or already configured';
+            END;
+        END $$;
+    """)
+    op.execute("""
+        ALTER TABLE speeches ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('bulgarian'::regconfig, coalesce(speech_content, ''))) STORED
+    """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_speeches_search_vector ON speeches USING gin (search_vector)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_speeches_search_vector")
+    op.execute("ALTER TABLE speeches DROP COLUMN search_vector")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS bulgarian")
+    op.execute("DROP TEXT SEARCH DICTIONARY IF EXISTS bulgarian_ispell")
@@ -0,0 +1,37 @@
+"""sitting dates and the data version stamp
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-08-05 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sittings",
+        sa.Column("sitting_date", sa.Date(), primary_key=True),
+    )
+    op.execute(
+        "INSERT INTO sittings (sitting_date) "
+        "SELECT DISTINCT datestamp FROM speeches WHERE datestamp IS NOT NULL"
+    )
+    op.create_table(
+        "data_version",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.execute("INSERT INTO data_version (id, version, updated_at) VALUES (1, 1, now())")
+
+
+def downgrade():
+    op.drop_table("data_version")
+    op.drop_table("sittings")
@@ -0,0 +1,43 @@
+"""daily speech statistics
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-08-12 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "speech_stats_daily",
+        sa.Column("stat_date", sa.Date(), primary_key=True),
+        sa.Column("speaker_id", sa.Integer(), sa.ForeignKey("speakers.speaker_id"), primary_key=True),
+        sa.Column("party_id", sa.Integer(), sa.ForeignKey("parties.party_id"), primary_key=True),
+        sa.Column("from_tribune", sa.Boolean(), primary_key=True),
+        sa.Column("speeches", sa.Integer(), nullable=False),
+        sa.Column("words", sa.BigInteger(), nullable=False),
+        sa.Column("chars", sa.BigInteger(), nullable=False),
+    )
+    op.execute("""
+        INSERT INTO speech_stats_daily (stat_date, speaker_id, party_id, from_tribune, speeches, words, chars)
+        SELECT s.datestamp, a.speaker_speaker_id, a.party_party_id, coalesce(s.from_tribune, true),
+               count(*),
+               sum(CASE WHEN coalesce(btrim(s.speech_content), '') = '' THEN 0
+                        ELSE array_length(regexp_split_to_array(btrim(s.speech_content), '\\s+'), 1) END),
+               sum(coalesce(char_length(s.speech_content), 0))
+        FROM speeches s
+        JOIN affiliations a ON s.affiliation_id = a.affiliation_id
+        WHERE s.datestamp IS NOT NULL
+        GROUP BY s.datestamp, a.speaker_speaker_id, a.party_party_id, coalesce(s.from_tribune, true)
+    """)
+
+
+def downgrade():
+    op.drop_table("speech_stats_daily")
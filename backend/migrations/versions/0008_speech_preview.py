@@ -0,0 +1,29 @@
+"""speech preview and length columns
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-08-18 00:00:00
+"""
+from alembic import op
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # One ALTER so the table is rewritten once. The 300 must match models.CONTENT_PREVIEW_CHARS;
+    # changing it later means dropping and re-adding content_preview.
+    op.execute("""
+        ALTER TABLE speeches
+            ADD COLUMN content_preview text
+                GENERATED ALWAYS AS (left(coalesce(speech_content, ''), 300)) STORED,
+            ADD COLUMN content_length integer
+                GENERATED ALWAYS AS (char_length(coalesce(speech_content, ''))) STORED
+    """)
+
+
+def downgrade():
+    op.execute("ALTER TABLE speeches DROP COLUMN content_length, DROP COLUMN content_preview")
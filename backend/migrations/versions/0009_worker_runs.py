@@ -0,0 +1,33 @@
+"""worker run history
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-08-22 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "worker_runs",
+        sa.Column("run_id", sa.Integer(), primary_key=True),
+        sa.Column("job", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+        sa.Column("rows", sa.Integer()),
+        sa.Column("error", sa.Text()),
+    )
+    op.create_index("ix_worker_runs_job_started", "worker_runs", ["job", sa.text("started_at DESC")])
+
+
+def downgrade():
+    op.drop_index("ix_worker_runs_job_started", table_name="worker_runs")
+    op.drop_table("worker_runs")
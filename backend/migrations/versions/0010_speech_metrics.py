@@ -0,0 +1,38 @@
+"""speech metrics and the unprocessed backlog index
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-08-27 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "speech_metrics",
+        sa.Column("speech_id", sa.Integer(), sa.ForeignKey("speeches.speech_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("tokens", sa.Integer(), nullable=False),
+        sa.Column("types", sa.Integer(), nullable=False),
+        sa.Column("sentences", sa.Integer(), nullable=False),
+        sa.Column("type_token_ratio", sa.Float(), nullable=False),
+        sa.Column("normalized_text", sa.Text(), nullable=False),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    # Every existing speech is still unprocessed, so the partial index starts out full
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_speeches_unprocessed ON speeches (speech_id) WHERE processed IS NOT TRUE"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_speeches_unprocessed")
+    op.drop_table("speech_metrics")
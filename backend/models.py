@@ -1,10 +1,26 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Date, UniqueConstraint
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, Float, ForeignKey, Date, DateTime, UniqueConstraint, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, declarative_base, deferred
 from sqlalchemy.ext.hybrid import hybrid_property
 import datetime
+import hashlib
+import unicodedata
 
 Base = declarative_base()
 
+# Text search configuration created by migration 0005 (simple + optional Bulgarian ispell dictionary)
+TEXT_SEARCH_CONFIG = "bulgarian"
+
+# Characters of each speech returned by the list endpoints (migration 0008)
+CONTENT_PREVIEW_CHARS = 300
+
+def speech_fingerprint(text: str | None) -> str:
+    """
+    SHA-256 of the NFKC-normalized, whitespace-collapsed speech text.
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", text or "").split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
 class Speaker(Base):
     __tablename__ = 'speakers'
     __table_args__ = (
@@ -12,7 +28,7 @@ class Speaker(Base):
     )
 
     speaker_id = Column(Integer, primary_key=True)
-    speaker_name = Column(String, nullable=False)
+    speaker_name = Column(String, nullable=False, index=True)
     first_name = Column(String, nullable=False)
     middle_name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
@@ -47,7 +63,7 @@ class SpeakerPartyAffiliation(Base):
 
     affiliation_id = Column(Integer, primary_key=True)
     speaker_speaker_id = Column(Integer, ForeignKey("speakers.speaker_id"))
-    party_party_id = Column(Integer, ForeignKey("parties.party_id"))
+    party_party_id = Column(Integer, ForeignKey("parties.party_id"), index=True)
     start_date = Column(Date)
     end_date = Column(Date, nullable=True)
 
@@ -60,13 +76,116 @@ class SpeakerPartyAffiliation(Base):
 
 class Speech(Base):
     __tablename__ = 'speeches'
+    __table_args__ = (
+        UniqueConstraint('datestamp', 'affiliation_id', 'content_hash', name='uq_speech_fingerprint'),
+    )
 
     speech_id = Column(Integer, primary_key=True)
     speech_content = Column(Text)
+    content_hash = Column(String(64), nullable=False)
     from_tribune = Column(Boolean, default=True)
     datestamp = Column(Date, default=datetime.date.today)
     processed = Column(Boolean, default=False)
     is_continuation = Column(Boolean, default=False)
-
-    affiliation_id = Column(Integer, ForeignKey("affiliations.affiliation_id"))
+    # Maintained by Postgres on every insert/update; deferred so ORM loads skip it
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        f"to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, coalesce(speech_content, ''))", persisted=True
+    )))
+    # Stored inline next to the row, so speech lists never have to detoast speech_content
+    content_preview = Column(Text, Computed(
+        f"left(coalesce(speech_content, ''), {CONTENT_PREVIEW_CHARS})", persisted=True
+    ))
+    content_length = Column(Integer, Computed("char_length(coalesce(speech_content, ''))", persisted=True))
+
+    affiliation_id = Column(Integer, ForeignKey("affiliations.affiliation_id"), index=True)
     affiliation = relationship("SpeakerPartyAffiliation", back_populates="speeches")
+
+# Matches the list ordering (datestamp desc, speech_id asc) used for keyset pagination
+Index("ix_speeches_datestamp_id", Speech.datestamp.desc(), Speech.speech_id)
+Index("ix_speeches_search_vector", Speech.search_vector, postgresql_using="gin")
+# Only the backlog of process_speeches.py; empties as speeches are processed
+Index("ix_speeches_unprocessed", Speech.speech_id, postgresql_where=text("processed IS NOT TRUE"))
+
+class IngestionLog(Base):
+    __tablename__ = 'ingestion_log'
+
+    t_id = Column(Integer, primary_key=True)  # parliament.bg stenogram id
+    sitting_date = Column(Date, nullable=False, index=True)
+    status = Column(String, nullable=False, default="running")  # running | complete | failed | quarantined
+    attempts = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    rows_parsed = Column(Integer)
+    rows_inserted = Column(Integer)
+    rows_skipped = Column(Integer)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"IngestionLog(t_id={self.t_id}, date={self.sitting_date}, status='{self.status}')"
+
+class Sitting(Base):
+    """One row per date with speeches; keeps the filter date list off the speeches table."""
+    __tablename__ = 'sittings'
+
+    sitting_date = Column(Date, primary_key=True)
+
+    def __repr__(self):
+        return f"Sitting(date={self.sitting_date})"
+
+class DataVersion(Base):
+    """Single-row stamp bumped whenever ingestion changes what the API serves."""
+    __tablename__ = 'data_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"DataVersion(version={self.version}, updated_at={self.updated_at})"
+
+class SpeechStatsDaily(Base):
+    """Speech counts and sizes per day, speaker, party and place; refreshed by speech_stats.py."""
+    __tablename__ = 'speech_stats_daily'
+
+    stat_date = Column(Date, primary_key=True)
+    speaker_id = Column(Integer, ForeignKey("speakers.speaker_id"), primary_key=True)
+    party_id = Column(Integer, ForeignKey("parties.party_id"), primary_key=True)
+    from_tribune = Column(Boolean, primary_key=True)
+    speeches = Column(Integer, nullable=False)
+    words = Column(BigInteger, nullable=False)
+    chars = Column(BigInteger, nullable=False)
+
+    def __repr__(self):
+        return f"SpeechStatsDaily(date={self.stat_date}, speaker_id={self.speaker_id}, party_id={self.party_id}, speeches={self.speeches})"
+
+class WorkerRun(Base):
+    """One scheduled or manual job run of the worker daemon (worker/worker.py)."""
+    __tablename__ = 'worker_runs'
+
+    run_id = Column(Integer, primary_key=True)
+    job = Column(String, nullable=False)  # roster | ingest | process
+    status = Column(String, nullable=False, default="running")  # running | success | failed
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True))
+    rows = Column(Integer)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"WorkerRun(id={self.run_id}, job='{self.job}', status='{self.status}')"
+
+Index("ix_worker_runs_job_started", WorkerRun.job, WorkerRun.started_at.desc())
+
+class SpeechMetrics(Base):
+    """Per-speech text metrics written by process_speeches.py; dropped with the speech on rebuilds."""
+    __tablename__ = 'speech_metrics'
+
+    speech_id = Column(Integer, ForeignKey("speeches.speech_id", ondelete="CASCADE"), primary_key=True)
+    tokens = Column(Integer, nullable=False)
+    types = Column(Integer, nullable=False)
+    sentences = Column(Integer, nullable=False)
+    type_token_ratio = Column(Float, nullable=False)
+    normalized_text = Column(Text, nullable=False)
+    processed_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"SpeechMetrics(speech_id={self.speech_id}, tokens={self.tokens}, sentences={self.sentences})"
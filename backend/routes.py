@@ -1,28 +1,68 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, and_, or_, func, case, cast, literal_column, text, Date
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Tuple
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import base64
+import binascii
+import csv
+import io
+import json
+import os
 
-from db import get_db
-from models import Speech, Speaker, Party, SpeakerPartyAffiliation
-from schemas import SpeechOut, FilterOptionsOut
+from async_db import AsyncSessionLocal, get_async_db
+from models import Speech, Speaker, Party, SpeakerPartyAffiliation, Sitting, SpeechStatsDaily, WorkerRun, IngestionLog, TEXT_SEARCH_CONFIG
+from data_version import fetch_data_version
+from schemas import SpeechOut, SpeechSearchOut, SpeechDetailOut, FilterOptionsOut, StatsRowOut, WorkerRunsOut
 
 router = APIRouter()
 
-@router.get("/speeches", response_model=List[SpeechOut])
-def get_speeches(
-    db: Session = Depends(get_db),
-    speaker_ids: Optional[List[int]] = Query(None),
-    party_ids: Optional[List[int]] = Query(None),
-    from_tribune: Optional[bool] = Query(None),
-    date_from: Optional[date] = Query(None),
-    date_to: Optional[date] = Query(None),
-    skip: int = 0,
-    limit: int = 20
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Inlined rather than bound, so explain_queries.py can render the statement with literal binds
+TS_CONFIG = literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+
+# Rows fetched from the server-side cursor per round trip and written per chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+EXPORT_COLUMNS = (
+    "speech_id", "datestamp", "speaker_name", "party_name", "party_abbreviation", "from_tribune", "speech_content"
+)
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter= … "
+
+
+def encode_cursor(datestamp: date, speech_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{datestamp.isoformat()}:{speech_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        datestamp, speech_id = raw.split(":")
+        return date.fromisoformat(datestamp), int(speech_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def build_speeches_query(
+    speaker_ids: Optional[List[int]] = None,
+    party_ids: Optional[List[int]] = None,
+    from_tribune: Optional[bool] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
 ):
-    query = db.query(
+    """
+    Filtered speech list in API order. Shared with explain_queries.py so the
+    plans checked before deploy are the ones the endpoint actually runs.
+    Selects the stored preview, never speech_content itself.
+    """
+    query = select(
         Speech.speech_id,
-        Speech.speech_content,
+        Speech.content_preview,
+        Speech.content_length,
         Speech.datestamp,
         Speech.from_tribune,
         Speaker.speaker_name,
@@ -43,18 +83,283 @@ def get_speeches(
     if date_to:
         query = query.filter(Speech.datestamp <= date_to)
 
-    return query.order_by(Speech.datestamp.desc(), Speech.speech_id.asc()).offset(skip).limit(limit).all()
+    return query.order_by(Speech.datestamp.desc(), Speech.speech_id.asc())
 
 
-@router.get("/speeches/filters", response_model=FilterOptionsOut)
-def get_filter_options(db: Session = Depends(get_db)):
-    speakers = db.query(Speaker.speaker_id, Speaker.speaker_name, Speaker.middle_name).order_by(Speaker.speaker_name).distinct().all()
-    parties = db.query(Party.party_id, Party.party_name, Party.party_abbreviation).order_by(Party.party_name).all()
-    dates = db.query(Speech.datestamp).order_by(Speech.datestamp).distinct().all()
+def paginate(query, skip: int = 0, limit: int = 20, cursor: Optional[str] = None):
+    # Keyset pagination: continue right after the last row of the previous page,
+    # walking ix_speeches_datestamp_id instead of discarding `skip` rows.
+    # The OR can't bound the index scan; the redundant datestamp <= does, so the
+    # scan starts at the cursor instead of filtering out every newer row.
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        query = query.filter(Speech.datestamp <= last_date, or_(
+            Speech.datestamp < last_date,
+            and_(Speech.datestamp == last_date, Speech.speech_id > last_id)
+        ))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+@router.get("/speeches", response_model=List[SpeechOut])
+async def get_speeches(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    speaker_ids: Optional[List[int]] = Query(None),
+    party_ids: Optional[List[int]] = Query(None),
+    from_tribune: Optional[bool] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header; replaces skip")
+):
+    query = build_speeches_query(speaker_ids, party_ids, from_tribune, date_from, date_to)
+    rows = (await db.execute(paginate(query, skip, limit, cursor))).all()
+    if len(rows) == limit and rows:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].datestamp, rows[-1].speech_id)
+    return rows
+
+
+def build_search_query(
+    q: str,
+    skip: int = 0,
+    limit: int = 20,
+    **filters
+):
+    tsquery = func.websearch_to_tsquery(TS_CONFIG, q)
+    rank = func.ts_rank_cd(Speech.search_vector, tsquery)
+
+    # Rank every match through the GIN index, but only read the full text
+    # and build snippets for the returned page
+    page = build_speeches_query(**filters
+    ).add_columns(rank.label("rank"), Speech.speech_content
+    ).filter(Speech.search_vector.op("@@")(tsquery)
+    ).order_by(None).order_by(rank.desc(), Speech.datestamp.desc(), Speech.speech_id.asc()
+    ).offset(skip).limit(limit).subquery()
+
+    headline = func.ts_headline(TS_CONFIG, page.c.speech_content, tsquery, HEADLINE_OPTIONS)
+    columns = [c for c in page.c if c.name != "speech_content"]
+    return select(*columns, headline.label("snippet")).order_by(
+        page.c.rank.desc(), page.c.datestamp.desc(), page.c.speech_id.asc()
+    )
+
+
+@router.get("/speeches/search", response_model=List[SpeechSearchOut])
+async def search_speeches(
+    q: str = Query(..., min_length=2, description="Web-search syntax: words, \"phrases\", or, -excluded"),
+    db: AsyncSession = Depends(get_async_db),
+    speaker_ids: Optional[List[int]] = Query(None),
+    party_ids: Optional[List[int]] = Query(None),
+    from_tribune: Optional[bool] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    skip: int = 0,
+    limit: int = 20
+):
+    query = build_search_query(
+        q, skip, limit,
+        speaker_ids=speaker_ids, party_ids=party_ids, from_tribune=from_tribune,
+        date_from=date_from, date_to=date_to
+    )
+    return (await db.execute(query)).all()
+
+
+def export_lines(rows, fmt: str) -> str:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([getattr(row, c) for c in EXPORT_COLUMNS] for row in rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps({c: getattr(row, c) for c in EXPORT_COLUMNS}, ensure_ascii=False, default=str) + "\n"
+        for row in rows
+    )
+
+
+async def stream_export(request: Request, query, fmt: str):
+    """
+    Streams the filtered corpus in EXPORT_BATCH_SIZE chunks from a server-side
+    cursor, so memory stays flat however many rows match. Uses its own session
+    because the response body outlives the request's dependencies.
+    """
+    if fmt == "csv":
+        yield ",".join(EXPORT_COLUMNS) + "\r\n"
+    async with AsyncSessionLocal() as db:
+        if db.bind.dialect.name == "postgresql":
+            # DB_STATEMENT_TIMEOUT_MS is sized for page queries, not a full-corpus cursor
+            await db.execute(text("SET LOCAL statement_timeout = 0"))
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        try:
+            async for rows in result.partitions():
+                if await request.is_disconnected():
+                    break
+                yield export_lines(rows, fmt)
+        finally:
+            await result.close()
+
+
+@router.get("/speeches/export")
+async def export_speeches(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    speaker_ids: Optional[List[int]] = Query(None),
+    party_ids: Optional[List[int]] = Query(None),
+    from_tribune: Optional[bool] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None)
+):
+    """The whole filtered corpus with full texts, in list order, as NDJSON or CSV."""
+    query = build_speeches_query(speaker_ids, party_ids, from_tribune, date_from, date_to
+    ).add_columns(Speech.speech_content)
+    return StreamingResponse(
+        stream_export(request, query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="speeches.{format}"'}
+    )
+
+
+async def load_filter_options(db: AsyncSession) -> dict:
+    speakers = (await db.execute(
+        select(Speaker.speaker_id, Speaker.speaker_name, Speaker.middle_name).order_by(Speaker.speaker_name).distinct()
+    )).all()
+    parties = (await db.execute(
+        select(Party.party_id, Party.party_name, Party.party_abbreviation).order_by(Party.party_name)
+    )).all()
+    dates = (await db.execute(select(Sitting.sitting_date).order_by(Sitting.sitting_date))).all()
 
     return {
         "speakers": [{"id": s.speaker_id, "name": s.speaker_name, "middle_name": getattr(s, "middle_name", None)} for s in speakers],
         "parties": [{"id": p.party_id, "name": p.party_name, "abbr": p.party_abbreviation} for p in parties],
         "from_tribune_options": [True, False],
-        "dates": [d.datestamp for d in dates]
+        "dates": [d.sitting_date for d in dates]
     }
+
+
+def not_modified(if_none_match: Optional[str], if_modified_since: Optional[str], etag: str, updated_at: datetime) -> bool:
+    # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110 13.2.2)
+    if if_none_match:
+        return etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*"
+    if if_modified_since:
+        try:
+            return updated_at.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+# Filter payload of the last data version seen by this process
+_filter_cache: dict = {}
+
+
+@router.get("/speeches/filters", response_model=FilterOptionsOut)
+async def get_filter_options(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None)
+):
+    version, updated_at = await fetch_data_version(db)
+    cached = _filter_cache.get("entry")
+    if not cached or cached["version"] != version:
+        cached = {
+            "version": version,
+            "etag": f'W/"filters-{version}"',
+            "last_modified": format_datetime(updated_at.astimezone(timezone.utc), usegmt=True),
+            "payload": FilterOptionsOut(**(await load_filter_options(db))),
+        }
+        _filter_cache["entry"] = cached
+
+    headers = {"ETag": cached["etag"], "Last-Modified": cached["last_modified"], "Cache-Control": "no-cache"}
+    if not_modified(if_none_match, if_modified_since, cached["etag"], updated_at):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return cached["payload"]
+
+
+def build_speech_query(speech_id: int):
+    """One speech with its full text, for the detail endpoint."""
+    return build_speeches_query().add_columns(Speech.speech_content
+    ).filter(Speech.speech_id == speech_id).order_by(None)
+
+
+# Declared after the fixed /speeches/... paths so it does not shadow them
+@router.get("/speeches/{speech_id}", response_model=SpeechDetailOut)
+async def get_speech(speech_id: int, db: AsyncSession = Depends(get_async_db)):
+    speech = (await db.execute(build_speech_query(speech_id))).first()
+    if speech is None:
+        raise HTTPException(status_code=404, detail="Speech not found")
+    return speech
+
+
+@router.get("/stats", response_model=List[StatsRowOut])
+async def get_stats(
+    db: AsyncSession = Depends(get_async_db),
+    period: Literal["day", "month", "year"] = "month",
+    group_by: List[Literal["party", "speaker"]] = Query(["party"]),
+    speaker_ids: Optional[List[int]] = Query(None),
+    party_ids: Optional[List[int]] = Query(None),
+    from_tribune: Optional[bool] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None)
+):
+    """Aggregates read from speech_stats_daily; never touches the speeches table."""
+    stats = SpeechStatsDaily
+    # `period` is one of three literals; inlining it keeps SELECT and GROUP BY textually identical
+    bucket = cast(func.date_trunc(literal_column(f"'{period}'"), stats.stat_date), Date).label("period")
+    columns = [bucket]
+    group = [bucket]
+    joins = []
+
+    if "speaker" in group_by:
+        columns += [Speaker.speaker_id, Speaker.speaker_name]
+        group += [Speaker.speaker_id, Speaker.speaker_name]
+        joins.append((Speaker, stats.speaker_id == Speaker.speaker_id))
+    if "party" in group_by:
+        columns += [Party.party_id, Party.party_name, Party.party_abbreviation]
+        group += [Party.party_id, Party.party_name, Party.party_abbreviation]
+        joins.append((Party, stats.party_id == Party.party_id))
+
+    query = select(
+        *columns,
+        func.sum(stats.speeches).label("speeches"),
+        func.sum(case((stats.from_tribune, stats.speeches), else_=0)).label("from_tribune"),
+        func.sum(case((stats.from_tribune, 0), else_=stats.speeches)).label("from_seat"),
+        func.sum(stats.words).label("words"),
+        func.sum(stats.chars).label("chars"),
+    ).select_from(stats)
+    for target, onclause in joins:
+        query = query.join(target, onclause)
+
+    if speaker_ids:
+        query = query.filter(stats.speaker_id.in_(speaker_ids))
+    if party_ids:
+        query = query.filter(stats.party_id.in_(party_ids))
+    if from_tribune is not None:
+        query = query.filter(stats.from_tribune == from_tribune)
+    if date_from:
+        query = query.filter(stats.stat_date >= date_from)
+    if date_to:
+        query = query.filter(stats.stat_date <= date_to)
+
+    return (await db.execute(query.group_by(*group).order_by(*group))).all()
+
+
+@router.get("/worker/runs", response_model=WorkerRunsOut)
+async def get_worker_runs(
+    db: AsyncSession = Depends(get_async_db),
+    job: Optional[str] = Query(None),
+    limit: int = Query(50, le=500)
+):
+    """Recent worker runs, newest first, the last successful run of every job and the quarantined sittings."""
+    last_success = (await db.execute(
+        select(WorkerRun.job, func.max(WorkerRun.finished_at)).where(WorkerRun.status == "success").group_by(WorkerRun.job)
+    )).all()
+    query = select(WorkerRun).order_by(WorkerRun.started_at.desc()).limit(limit)
+    if job:
+        query = query.filter(WorkerRun.job == job)
+    runs = (await db.execute(query)).scalars().all()
+    quarantined = (await db.execute(
+        select(IngestionLog).where(IngestionLog.status == "quarantined").order_by(IngestionLog.sitting_date)
+    )).scalars().all()
+    return {"last_success": dict(last_success), "runs": runs, "quarantined": quarantined}
@@ -1,11 +1,12 @@
 from pydantic import BaseModel
-from datetime import date
-from typing import List
+from datetime import date, datetime
+from typing import Dict, List, Optional
 
 
 class SpeechOut(BaseModel):
     speech_id: int
-    speech_content: str
+    content_preview: str
+    content_length: int
     datestamp: date
     from_tribune: bool
     speaker_name: str
@@ -16,6 +17,15 @@ class SpeechOut(BaseModel):
         orm_mode = True
 
 
+class SpeechSearchOut(SpeechOut):
+    rank: float
+    snippet: str
+
+
+class SpeechDetailOut(SpeechOut):
+    speech_content: str
+
+
 class SpeakerOption(BaseModel):
     id: int
     name: str
@@ -32,3 +42,48 @@ class FilterOptionsOut(BaseModel):
     parties: List[PartyOption]
     from_tribune_options: List[bool]
     dates: List[date]
+
+
+class StatsRowOut(BaseModel):
+    period: date
+    speaker_id: Optional[int] = None
+    speaker_name: Optional[str] = None
+    party_id: Optional[int] = None
+    party_name: Optional[str] = None
+    party_abbreviation: Optional[str] = None
+    speeches: int
+    from_tribune: int
+    from_seat: int
+    words: int
+    chars: int
+
+
+class WorkerRunOut(BaseModel):
+    run_id: int
+    job: str
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    rows: Optional[int] = None
+    error: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+
+class QuarantinedSittingOut(BaseModel):
+    t_id: int
+    sitting_date: date
+    attempts: int
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+
+class WorkerRunsOut(BaseModel):
+    last_success: Dict[str, datetime]
+    runs: List[WorkerRunOut]
+    # Sittings ingestion gave up on; see INGEST_MAX_ATTEMPTS
+    quarantined: List[QuarantinedSittingOut]
@@ -0,0 +1,48 @@
+from sqlalchemy import select, delete, func, case, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from models import Speech, SpeakerPartyAffiliation, SpeechStatsDaily
+from datetime import date
+from typing import Optional
+
+
+def word_count(column):
+    trimmed = func.btrim(column)
+    return case(
+        (func.coalesce(trimmed, "") == "", 0),
+        else_=func.array_length(func.regexp_split_to_array(trimmed, r"\s+"), 1),
+    )
+
+
+def daily_stats_select(date_from: date, date_to: date):
+    from_tribune = func.coalesce(Speech.from_tribune, true())
+    return select(
+        Speech.datestamp,
+        SpeakerPartyAffiliation.speaker_speaker_id,
+        SpeakerPartyAffiliation.party_party_id,
+        from_tribune,
+        func.count(),
+        func.sum(word_count(Speech.speech_content)),
+        func.sum(func.coalesce(func.char_length(Speech.speech_content), 0)),
+    ).join(
+        SpeakerPartyAffiliation, Speech.affiliation_id == SpeakerPartyAffiliation.affiliation_id
+    ).where(
+        Speech.datestamp.between(date_from, date_to)
+    ).group_by(
+        Speech.datestamp, SpeakerPartyAffiliation.speaker_speaker_id,
+        SpeakerPartyAffiliation.party_party_id, from_tribune,
+    )
+
+
+def refresh_speech_stats(db: Session, date_from: date, date_to: Optional[date] = None) -> int:
+    """
+    Recompute the daily aggregates for a date range inside the caller's
+    transaction, so they commit together with the speeches they describe.
+    """
+    date_to = date_to or date_from
+    db.execute(delete(SpeechStatsDaily).where(SpeechStatsDaily.stat_date.between(date_from, date_to)))
+    result = db.execute(insert(SpeechStatsDaily).from_select(
+        ["stat_date", "speaker_id", "party_id", "from_tribune", "speeches", "words", "chars"],
+        daily_stats_select(date_from, date_to),
+    ))
+    return result.rowcount
@@ -0,0 +1,15 @@
+"""
+Repeatable benchmarks for the ingestion pipeline and the API, run against a
+synthetic corpus (see corpus.py). Usage is in run.py.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT, "backend")
+SCRIPTS_DIR = os.path.join(ROOT, "worker", "scripts")
+
+# Same layout as the worker container: scripts import each other and the backend by module name.
+for path in (BACKEND_DIR, SCRIPTS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
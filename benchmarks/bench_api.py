@@ -0,0 +1,116 @@
+"""
+API latency of /speeches and /speeches/filters over HTTP, against whatever
+the database holds (normally the corpus bench_ingest just loaded).
+
+The API runs under uvicorn in a child process, as in production, unless
+--api-url points at one that is already running.
+"""
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterator, Optional
+from sqlalchemy import func
+from db import SessionLocal
+from models import Speech
+from data_version import bump_data_version
+from . import BACKEND_DIR
+from .timing import summarize
+import os
+import socket
+import subprocess
+import sys
+import time
+import requests
+
+
+@contextmanager
+def api_server(database_url: str) -> Iterator[str]:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = {**os.environ, "DATABASE_URL": database_url, "SQL_ECHO": "0"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"API exited with status {process.returncode} during startup")
+            try:
+                requests.get(f"{base_url}/metrics", timeout=1)
+                break
+            except requests.ConnectionError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("API did not start within 30s")
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def latency(session: requests.Session, request: Callable[[], requests.Response], count: int, warmup: int = 3,
+            before: Optional[Callable[[], None]] = None) -> dict:
+    """`count` sequential requests; `before` runs untimed ahead of each one."""
+    for _ in range(warmup):
+        request()
+    samples = []
+    for _ in range(count):
+        if before:
+            before()
+        started = time.perf_counter()
+        response = request()
+        samples.append(time.perf_counter() - started)
+    return {"status": response.status_code, "bytes": len(response.content), "seconds": summarize(samples)}
+
+
+def run(database_url: str, requests_per_case: int, api_url: Optional[str] = None) -> dict:
+    def invalidate_filters():
+        # What ingestion does after a sitting: the API's filters cache is keyed on this version
+        db = SessionLocal()
+        try:
+            bump_data_version(db)
+            db.commit()
+        finally:
+            db.close()
+
+    with (nullcontext(api_url.rstrip("/")) if api_url else api_server(database_url)) as base_url:
+        session = requests.Session()
+
+        def get(path: str, **kwargs):
+            response = session.get(f"{base_url}{path}", **kwargs)
+            if response.status_code >= 400:
+                raise RuntimeError(f"GET {path} returned {response.status_code}: {response.text[:200]}")
+            return response
+
+        db = SessionLocal()
+        try:
+            total = db.query(func.count(Speech.speech_id)).scalar()
+        finally:
+            db.close()
+        if not total:
+            raise RuntimeError("the database has no speeches; run the ingest suite first")
+        # Deep in the result set, where an unbounded keyset scan costs as much as OFFSET
+        deep_skip = max(0, total * 9 // 10 - 20)
+        cursor = get("/speeches", params={"limit": 20, "skip": deep_skip}).headers.get("X-Next-Cursor")
+        filters = get("/speeches/filters")
+        etag = filters.headers["ETag"]
+        party_id = next(p["id"] for p in filters.json()["parties"] if p["id"] > 3)
+
+        n = requests_per_case
+        cases = {
+            "speeches_first_page": latency(session, lambda: get("/speeches", params={"limit": 20}), n),
+            "speeches_deep_offset": latency(
+                session, lambda: get("/speeches", params={"limit": 20, "skip": deep_skip + 20}), n
+            ),
+            "speeches_deep_cursor": latency(session, lambda: get("/speeches", params={"limit": 20, "cursor": cursor}), n),
+            "speeches_party_filter": latency(
+                session, lambda: get("/speeches", params={"limit": 20, "party_ids": party_id}), n
+            ),
+            "filters_cached": latency(session, lambda: get("/speeches/filters"), n),
+            "filters_not_modified": latency(session, lambda: get("/speeches/filters", headers={"If-None-Match": etag}), n),
+            # A new data version makes the API rebuild the payload from the database
+            "filters_cold": latency(session, lambda: get("/speeches/filters"), n, before=invalidate_filters),
+        }
+    return {"requests_per_case": n, "external_api": bool(api_url), "deep_skip": deep_skip, "cases": cases}
@@ -0,0 +1,28 @@
+"""Stenogram parsing alone: parse_stenogram over every generated sitting."""
+from stenogram_parser import parse_stenogram
+from .corpus import SyntheticSitting
+from typing import List
+from .timing import measure, summarize
+
+
+def run(sittings: List[SyntheticSitting], repeat: int) -> dict:
+    bodies = [s.body for s in sittings]
+    megabytes = sum(len(body.encode("utf-8")) for body in bodies) / 1e6
+    turns = sum(1 for body in bodies for _ in parse_stenogram(body))
+
+    def parse_all():
+        for body in bodies:
+            for _ in parse_stenogram(body):
+                pass
+
+    timing = summarize(measure(parse_all, repeat))
+    return {
+        "sittings": len(bodies),
+        "megabytes": round(megabytes, 2),
+        "turns": turns,
+        # A mismatch means the parser and the generator disagree on what a speaker label is
+        "turns_expected": sum(len(s.expected) for s in sittings),
+        "seconds": timing,
+        "mb_per_second": megabytes / timing["median"],
+        "turns_per_second": turns / timing["median"],
+    }
@@ -0,0 +1,52 @@
+"""Speaker and party resolution: SittingResolver.resolve, parsing included, plus its accuracy."""
+from speech_resolution import SittingResolver
+from typing import List
+from .corpus import SyntheticCorpus, SyntheticSitting
+from .timing import summarize
+import time
+
+
+def run(corpus: SyntheticCorpus, sittings: List[SyntheticSitting], repeat: int, fuzzy_workers: int = 1) -> dict:
+    """
+    Each run starts from a fresh resolver, so the fuzzy memo is cold as it is
+    at the start of an ingestion. Accuracy compares every turn with the
+    affiliation the generator wrote it for; guests must stay unattributed.
+    """
+    samples = []
+    for _ in range(repeat):
+        resolver = SittingResolver(corpus.parties, corpus.affiliations, fuzzy_workers=fuzzy_workers)
+        fuzzy = {"speaker": [0, 0], "party": [0, 0]}
+        errors = {"guest_attributed": 0, "wrong_affiliation": 0, "unattributed": 0}
+        cache_hits = correct = total = 0
+        started = time.perf_counter()
+        for sitting in sittings:
+            speeches = resolver.resolve(sitting.body, sitting.t_date)
+            stats = resolver.last_stats
+            for matcher, (matched, unmatched) in stats.fuzzy.items():
+                fuzzy[matcher][0] += matched
+                fuzzy[matcher][1] += unmatched
+            cache_hits += stats.cache_hits
+            total += len(sitting.expected)
+            for speech, expected in zip(speeches, sitting.expected):
+                if speech.affiliation_id == expected:
+                    correct += 1
+                elif expected is None:
+                    errors["guest_attributed"] += 1
+                elif speech.affiliation_id is None:
+                    errors["unattributed"] += 1
+                else:
+                    errors["wrong_affiliation"] += 1
+        samples.append(time.perf_counter() - started)
+
+    timing = summarize(samples)
+    return {
+        "sittings": len(sittings),
+        "speeches": total,
+        "fuzzy_workers": fuzzy_workers,
+        "seconds": timing,
+        "speeches_per_second": total / timing["median"],
+        "accuracy": correct / total if total else None,
+        "errors": errors,
+        "fuzzy": {name: {"matched": m, "unmatched": u} for name, (m, u) in fuzzy.items()},
+        "continuation_cache_hits": cache_hits,
+    }
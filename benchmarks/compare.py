@@ -0,0 +1,55 @@
+"""
+Compare two results files from benchmarks.run, case by case on the median.
+
+    python -m benchmarks.compare before.json after.json [--threshold 0.1]
+
+Exits with 1 if any case got slower by more than the threshold.
+"""
+from typing import Iterator, Tuple
+import argparse
+import json
+import sys
+
+
+def timings(results: dict, path: str = "") -> Iterator[Tuple[str, float]]:
+    """Every summarize() block in the results, keyed by its dotted path."""
+    for key, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        if "median" in value:
+            yield path + key, value["median"]
+        else:
+            yield from timings(value, f"{path}{key}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark results files.")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+    if before["params"] != after["params"]:
+        print("⚠️ The runs used different parameters; timings may not be comparable.")
+
+    old = dict(timings(before["results"]))
+    regressions = 0
+    print(f"{'case':<60} {'before':>10} {'after':>10} {'change':>8}")
+    for name, median in timings(after["results"]):
+        if name not in old:
+            print(f"{name:<60} {'-':>10} {median * 1000:>8.2f}ms {'new':>8}")
+            continue
+        change = median / old[name] - 1 if old[name] else 0.0
+        flag = ""
+        if change > args.threshold:
+            regressions += 1
+            flag = " ⚠️"
+        print(f"{name:<60} {old[name] * 1000:>8.2f}ms {median * 1000:>8.2f}ms {change:>+8.1%}{flag}")
+
+    for key in ("commit", "created_at"):
+        print(f"ℹ️ {key}: {before.get(key)} → {after.get(key)}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,279 @@
+"""
+Synthetic parliament corpus: a roster snapshot plus `Pl_Sten_body` stenograms
+in the shape parliament.bg serves them. Stenograms have a header, Cyrillic
+speaker labels with party annotations, chair and minister turns, unannotated
+continuations, misspelled names, guests missing from the roster, and noise lines
+(votes, applause, replies).
+
+Every sitting is generated from (seed, t_id) alone, so a corpus of many years
+is produced lazily and any single sitting is reproducible. Each sitting also
+carries the affiliation every turn should resolve to, so resolution accuracy
+can be checked alongside speed.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterator, List, Optional
+import random
+
+from speech_resolution import SpeakerSnapshot, PartySnapshot, AffiliationSnapshot
+
+# Role parties and speakers, with the ids roster_sync.FALLBACK_ROLES and
+# speech_resolution.SPECIAL_ROLES expect
+ROLES = ["ПРЕДСЕДАТЕЛ", "МИНИСТЪР", "ДОКЛАДЧИК"]
+
+PARTIES = [
+    ("ГЕРБ – СДС", "ГЕРБ-СДС"),
+    ("Продължаваме Промяната – Демократична България", "ПП-ДБ"),
+    ("Възраждане", "ВЪЗРАЖДАНЕ"),
+    ("Демокрация, права и свободи – ДПС", "ДПС"),
+    ("БСП – Обединена левица", "БСП"),
+    ("Има Такъв Народ", "ИТН"),
+    ("Морал, единство, чест", "МЕЧ"),
+    ("Величие", "ВЕЛИЧИЕ"),
+]
+
+MALE_FIRST = ["Иван", "Георги", "Димитър", "Николай", "Петър", "Христо", "Стефан", "Александър", "Красимир",
+              "Васил", "Тодор", "Йордан", "Пламен", "Любомир", "Атанас", "Кирил", "Росен", "Цветан"]
+FEMALE_FIRST = ["Мария", "Елена", "Десислава", "Наталия", "Искра", "Росица", "Виктория", "Надежда",
+                "Цветелина", "Теодора", "Снежана", "Красимира", "Анна", "Милена", "Галина"]
+# Male surnames; women's take a trailing -а
+SURNAMES = ["Петров", "Иванов", "Георгиев", "Димитров", "Стоянов", "Николов", "Тодоров", "Христов",
+            "Костадинов", "Атанасов", "Ангелов", "Василев", "Кирилов", "Пешев", "Цветков", "Славчев",
+            "Михайлов", "Радев", "Йорданов", "Борисов", "Станчев", "Колев", "Илиев", "Маринов", "Стефанов",
+            "Павлов", "Симеонов", "Добрев"]
+
+MINISTRIES = ["НА ФИНАНСИТЕ", "НА ЗДРАВЕОПАЗВАНЕТО", "НА ОТБРАНАТА", "НА ВЪТРЕШНИТЕ РАБОТИ",
+              "НА ОБРАЗОВАНИЕТО И НАУКАТА", "НА ЗЕМЕДЕЛИЕТО И ХРАНИТЕ", "НА ЕНЕРГЕТИКАТА"]
+
+WORDS = (
+    "законопроект бюджет уважаеми колеги народни представители правителство министър предложение "
+    "комисия гласуване текст член алинея промени първо четене второ държавата гражданите средства "
+    "реформа съдебна система енергетика здравеопазване образование пенсии доходи инфлация данъци "
+    "общини инвестиции европейски фондове отговорност прозрачност контрол институциите решение "
+    "позиция подкрепа против въздържал мнение доклад срок изпълнение процедура дневен ред точка "
+    "регламент изказване реплика дуплика отрицателен вот мнозинство опозиция коалиция смятам "
+    "очевидно всъщност именно тук днес утре миналата година следващата седмица проблем въпрос"
+).split()
+
+HEADER = [
+    "ПЕТДЕСЕТ И ПЪРВО НАРОДНО СЪБРАНИЕ",
+    "ПЪРВА СЕСИЯ",
+    "ЗАСЕДАНИЕ",
+    "Председателствали: председателят {chair} и заместник-председателят {deputy}",
+    "Секретари: {secretary}",
+]
+
+NOISE = [
+    "(Ръкопляскания от „{party}“.)",
+    "(Шум и реплики.)",
+    "(Оживление.)",
+    "Гласували {total} народни представители: за {yes}, против {no}, въздържали се {abstain}.",
+    "Предложението е прието.",
+    "Предложението не е прието.",
+    "РЕПЛИКИ ОТ {abbr}: Срам!",
+    "РЕПЛИКА ОТ МЯСТОТО: Това не е вярно!",
+]
+
+
+@dataclass
+class SyntheticSitting:
+    t_id: int
+    t_date: date
+    body: str
+    # Affiliation each speaker turn should resolve to, in order; None for guests
+    expected: List[Optional[int]]
+
+    @property
+    def seating(self) -> dict:
+        """The archive-period record ingest_sitting expects."""
+        return {"t_id": self.t_id, "t_date": self.t_date.isoformat()}
+
+
+class SyntheticCorpus:
+    """
+    Roster and stenograms for `years` of sittings from `start`, three sitting
+    days a week outside the August recess. The roster is fixed for the whole
+    run, with `switch_rate` of the MPs changing party halfway through.
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        years: float = 1.0,
+        start: date = date(2021, 1, 1),
+        mps: int = 240,
+        turns_per_sitting: tuple[int, int] = (60, 180),
+        switch_rate: float = 0.05,
+        typo_rate: float = 0.03,
+        guest_rate: float = 0.02,
+    ):
+        self.seed = seed
+        self.start = start
+        self.end = start + timedelta(days=round(365.25 * years))
+        self.turns_per_sitting = turns_per_sitting
+        self.typo_rate = typo_rate
+        self.guest_rate = guest_rate
+        rng = random.Random(f"{seed}:roster")
+
+        self.parties = [PartySnapshot(i + 1, role, "") for i, role in enumerate(ROLES)]
+        self.parties += [
+            PartySnapshot(len(ROLES) + i + 1, name, abbr) for i, (name, abbr) in enumerate(PARTIES)
+        ]
+        political = self.parties[len(ROLES):]
+
+        self.speakers = [SpeakerSnapshot(i + 1, role, "", "", "") for i, role in enumerate(ROLES)]
+        self.affiliations = [
+            AffiliationSnapshot(i + 1, i + 1, i + 1, None, None, speaker) for i, speaker in enumerate(self.speakers)
+        ]
+        switch_date = start + (self.end - start) / 2
+        seen = set()
+        while len(self.speakers) < len(ROLES) + mps:
+            first, middle, last = self._person(rng)
+            # Labels carry first and last name only; keep them unambiguous, as they are in practice
+            if (first, last) in seen:
+                continue
+            seen.add((first, last))
+            speaker = SpeakerSnapshot(len(self.speakers) + 1, f"{first} {last}", first, middle, last)
+            self.speakers.append(speaker)
+            party = rng.choice(political)
+            if rng.random() < switch_rate:
+                new_party = rng.choice([p for p in political if p != party])
+                self._affiliate(speaker, party, start, switch_date - timedelta(days=1))
+                self._affiliate(speaker, new_party, switch_date, None)
+            else:
+                self._affiliate(speaker, party, start, None)
+
+        self.mps = self.speakers[len(ROLES):]
+        self.chairs = self.mps[:3]
+
+    @staticmethod
+    def _person(rng: random.Random) -> tuple[str, str, str]:
+        female = rng.random() < 0.35
+        first = rng.choice(FEMALE_FIRST if female else MALE_FIRST)
+        suffix = "а" if female else ""
+        return first, rng.choice(SURNAMES) + suffix, rng.choice(SURNAMES) + suffix
+
+    def _affiliate(self, speaker: SpeakerSnapshot, party: PartySnapshot, start: date, end: Optional[date]):
+        self.affiliations.append(AffiliationSnapshot(
+            len(self.affiliations) + 1, speaker.speaker_id, party.party_id, start, end, speaker
+        ))
+
+    def affiliation_on(self, speaker: SpeakerSnapshot, day: date) -> AffiliationSnapshot:
+        return next(
+            a for a in self.affiliations
+            if a.speaker_speaker_id == speaker.speaker_id
+            and a.start_date <= day and (a.end_date is None or day <= a.end_date)
+        )
+
+    def sitting_dates(self) -> Iterator[date]:
+        day = self.start
+        while day < self.end:
+            if day.weekday() in (2, 3, 4) and day.month != 8:
+                yield day
+            day += timedelta(days=1)
+
+    def sittings(self, limit: Optional[int] = None) -> Iterator[SyntheticSitting]:
+        for t_id, day in enumerate(self.sitting_dates(), start=10001):
+            if limit is not None and t_id - 10001 >= limit:
+                return
+            yield self.sitting(t_id, day)
+
+    # --- One stenogram ---
+
+    def sitting(self, t_id: int, day: date) -> SyntheticSitting:
+        rng = random.Random(f"{self.seed}:{t_id}")
+        party_by_id = {p.party_id: p for p in self.parties}
+        chair = rng.choice(self.chairs)
+        lines = [line.format(
+            chair=self._display(chair), deputy=self._display(rng.choice(self.chairs)),
+            secretary=", ".join(self._display(s) for s in rng.sample(self.mps, 2)),
+        ) for line in HEADER]
+        lines.append(f"Открито в 9,{rng.randint(0, 10):02} ч.")
+        expected = []
+        recent: list[SpeakerSnapshot] = []
+
+        def turn(label: str, affiliation_id: Optional[int], sentences: int):
+            paragraphs = self._paragraphs(rng, sentences)
+            lines.append(f"{label}: {paragraphs[0]}")
+            for paragraph in paragraphs[1:]:
+                lines.append(paragraph if rng.random() < 0.7 else f"<br />{paragraph}")
+            expected.append(affiliation_id)
+
+        turn(f"ПРЕДСЕДАТЕЛ {self._label(chair)}", 1, 2)
+        for _ in range(rng.randint(*self.turns_per_sitting)):
+            kind = rng.random()
+            if kind < 0.35:
+                turn(f"ПРЕДСЕДАТЕЛ {self._label(chair)}", 1, rng.randint(1, 3))
+            elif kind < 0.39:
+                minister = self._person(rng)
+                turn(f"МИНИСТЪР {rng.choice(MINISTRIES)} {minister[0].upper()} {minister[2].upper()}", 2,
+                     self._speech_length(rng))
+            elif kind < 0.42:
+                turn(f"ДОКЛАДЧИК {self._label(rng.choice(self.mps))}", 3, self._speech_length(rng))
+            elif kind < 0.42 + self.guest_rate:
+                guest = self._person(rng)
+                turn(f"{guest[0].upper()} {guest[2].upper()}", None, self._speech_length(rng))
+            else:
+                # Speakers of the last few turns sometimes come back without an annotation
+                if recent and rng.random() < 0.2:
+                    mp = rng.choice(recent[-3:])
+                    annotation = ""
+                else:
+                    mp = rng.choice(self.mps)
+                    annotation = self._annotation(rng, party_by_id[self.affiliation_on(mp, day).party_party_id])
+                label = self._label(mp)
+                if rng.random() < self.typo_rate:
+                    label = self._typo(rng, label)
+                turn(f"{label} {annotation}".rstrip(), self.affiliation_on(mp, day).affiliation_id,
+                     self._speech_length(rng))
+                recent.append(mp)
+
+            while rng.random() < 0.3:
+                party = rng.choice(self.parties[len(ROLES):])
+                total = rng.randint(150, 240)
+                yes = rng.randint(0, total)
+                no = rng.randint(0, total - yes)
+                lines.append(rng.choice(NOISE).format(
+                    party=party.party_name, abbr=party.party_abbreviation,
+                    total=total, yes=yes, no=no, abstain=total - yes - no,
+                ))
+
+        lines.append(f"(Закрито в 14,{rng.randint(0, 59):02} ч.)")
+        return SyntheticSitting(t_id, day, "\n".join(lines), expected)
+
+    @staticmethod
+    def _display(speaker: SpeakerSnapshot) -> str:
+        return f"{speaker.first_name} {speaker.last_name}"
+
+    @staticmethod
+    def _label(speaker: SpeakerSnapshot) -> str:
+        return f"{speaker.first_name} {speaker.last_name}".upper()
+
+    @staticmethod
+    def _annotation(rng: random.Random, party: PartySnapshot) -> str:
+        name = party.party_abbreviation if rng.random() < 0.85 else party.party_name
+        return f"({name}, от място)" if rng.random() < 0.25 else f"({name})"
+
+    @staticmethod
+    def _typo(rng: random.Random, label: str) -> str:
+        positions = [i for i, c in enumerate(label) if c != " "][1:-1]
+        i = rng.choice(positions)
+        return label[:i] + rng.choice("АЕИОУЪЮЯНТСР") + label[i + 1:]
+
+    @staticmethod
+    def _speech_length(rng: random.Random) -> int:
+        # Mostly a few sentences, with the occasional long speech of several kilobytes
+        return max(1, min(120, int(rng.lognormvariate(1.8, 0.9))))
+
+    @staticmethod
+    def _paragraphs(rng: random.Random, sentences: int) -> list[str]:
+        paragraphs, current = [], []
+        for _ in range(sentences):
+            words = rng.choices(WORDS, k=rng.randint(6, 22))
+            current.append(words[0].capitalize() + " " + " ".join(words[1:]) + rng.choice(".....!?"))
+            if rng.random() < 0.25:
+                paragraphs.append(" ".join(current))
+                current = []
+        if current:
+            paragraphs.append(" ".join(current))
+        return paragraphs
@@ -0,0 +1,28 @@
+from statistics import median, mean
+from typing import Callable, List
+import time
+
+
+def summarize(samples: List[float]) -> dict:
+    """Seconds per run; the median is what compare.py diffs."""
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "min": ordered[0],
+        "median": median(ordered),
+        "mean": mean(ordered),
+        "p95": ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+        "max": ordered[-1],
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, warmup: int = 1) -> List[float]:
+    """Wall time of `repeat` calls of `fn`, after `warmup` untimed ones."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
@@ -39,6 +39,18 @@ export const translations = {
         bg: 'Пълна реч',
         en: 'Full Speech',
     },
+    loading_speech: {
+        bg: 'Зареждане на речта…',
+        en: 'Loading speech…',
+    },
+    speech_load_failed: {
+        bg: 'Речта не можа да бъде заредена.',
+        en: 'The speech could not be loaded.',
+    },
+    close: {
+        bg: 'Затвори',
+        en: 'Close',
+    },
     from_tribune: {
         bg: 'От трибуна',
         en: 'From tribune',
@@ -1,6 +1,7 @@
 export interface Speech {
   speech_id: number
-  speech_content: string
+  content_preview: string
+  content_length: number
   datestamp: string
   from_tribune: boolean
   speaker_name: string
@@ -8,6 +9,10 @@ export interface Speech {
   party_name: string
 }
 
+export interface SpeechDetail extends Speech {
+  speech_content: string
+}
+
 export interface FilterOptions {
   speakers: { id: number; name: string; middle_name: string }[]
   parties: { id: number; name: string; abbr: string }[]
@@ -1,5 +1,5 @@
 import { defineStore } from 'pinia'
-import type { Speech, FilterOptions } from '@/interfaces/speech'
+import type { Speech, SpeechDetail, FilterOptions } from '@/interfaces/speech'
 
 export const useSpeechStore = defineStore('speech', {
     state: () => ({
@@ -55,6 +55,12 @@ export const useSpeechStore = defineStore('speech', {
             if (!res.ok) throw new Error('Failed to fetch speeches')
             this.speeches = await res.json()
             this.fetched = true
+        },
+        // The list only carries a preview; the full text is loaded when a speech is opened
+        async fetchSpeech(speechId: number): Promise<SpeechDetail> {
+            const res = await fetch(`http://localhost:8000/speeches/${speechId}`)
+            if (!res.ok) throw new Error('Failed to fetch speech')
+            return await res.json()
         }
     }
 })
@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Optional
+import gzip
+import json
+import os
+import re
+import tempfile
+from http_client import ParliamentClient, get_client
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "archive")
+
+
+class ArchiveMiss(LookupError):
+    pass
+
+
+@dataclass
+class ArchivedResponse:
+    body: bytes
+    from_archive: bool
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def period_is_open(year: int, month: int, today: Optional[date] = None) -> bool:
+    """
+    Current and previous month can still change upstream (new sittings,
+    late roster edits); anything older is treated as final.
+    """
+    today = today or date.today()
+    months_ago = (today.year - year) * 12 + (today.month - month)
+    return months_ago <= 1
+
+
+class ApiArchive:
+    """
+    Gzip-compressed on-disk copy of raw parliament.bg responses, keyed by
+    endpoint and id, e.g. archive/pl-sten/12345.json.gz plus a .meta.json with
+    the validators used for conditional GETs.
+
+    In offline mode the network is never touched and a missing entry raises
+    ArchiveMiss, which makes the archive usable as a fixed test fixture.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        offline: Optional[bool] = None,
+        revalidate_all: Optional[bool] = None,
+        client: Optional[ParliamentClient] = None,
+    ):
+        self.root = os.path.abspath(root or os.getenv("PARLIAMENT_ARCHIVE_DIR", DEFAULT_ARCHIVE_DIR))
+        self.offline = offline if offline is not None else os.getenv("PARLIAMENT_ARCHIVE_OFFLINE") == "1"
+        self.revalidate_all = (
+            revalidate_all if revalidate_all is not None else os.getenv("PARLIAMENT_ARCHIVE_REVALIDATE") == "1"
+        )
+        self._client = client
+
+    @property
+    def client(self) -> ParliamentClient:
+        if self._client is None:
+            self._client = get_client()
+        return self._client
+
+    def _path(self, endpoint: str, key) -> str:
+        safe_key = re.sub(r"[^\w.-]+", "_", str(key))
+        return os.path.join(self.root, endpoint, safe_key)
+
+    def _write_atomic(self, path: str, data: bytes):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def load(self, endpoint: str, key) -> Optional[bytes]:
+        try:
+            with gzip.open(self._path(endpoint, key) + ".json.gz", "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def meta(self, endpoint: str, key) -> dict:
+        try:
+            with open(self._path(endpoint, key) + ".meta.json", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_meta(self, endpoint: str, key, meta: dict):
+        self._write_atomic(self._path(endpoint, key) + ".meta.json", json.dumps(meta).encode("utf-8"))
+
+    def store(self, endpoint: str, key, body: bytes, url: str, headers=None):
+        headers = headers or {}
+        self._write_atomic(self._path(endpoint, key) + ".json.gz", gzip.compress(body, mtime=0))
+        self._write_meta(endpoint, key, {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def get(self, endpoint: str, key, url: str, revalidate: bool = False) -> ArchivedResponse:
+        """
+        Read-through fetch. Archived entries are returned as-is unless
+        `revalidate` is set, in which case a conditional GET is sent and a
+        304 keeps the archived body.
+        """
+        cached = self.load(endpoint, key)
+        if cached is not None and (self.offline or not (revalidate or self.revalidate_all)):
+            return ArchivedResponse(cached, True)
+        if self.offline:
+            raise ArchiveMiss(f"{endpoint}/{key} is not archived and the archive is offline")
+
+        meta = self.meta(endpoint, key) if cached is not None else {}
+        response = self.client.get_conditional(
+            url, endpoint=endpoint, etag=meta.get("etag"), last_modified=meta.get("last_modified")
+        )
+        if response.status_code == 304 and cached is not None:
+            meta["revalidated_at"] = datetime.now(timezone.utc).isoformat()
+            self._write_meta(endpoint, key, meta)
+            return ArchivedResponse(cached, True)
+
+        body = response.content
+        json.loads(body)  # never archive a body that isn't valid JSON
+        self.store(endpoint, key, body, url, response.headers)
+        return ArchivedResponse(body, False)
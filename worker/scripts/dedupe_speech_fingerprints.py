@@ -0,0 +1,86 @@
+"""
+Speeches that share a fingerprint (same sitting date, affiliation and
+normalized text) block the uq_speech_fingerprint constraint that alembic
+revision 0002 adds. The migration backfills content_hash and then stops,
+listing them; this script shows all of them and, only with --delete, removes
+every copy but the oldest.
+
+Each removed row is written to a CSV next to the row that was kept, so the
+deletion can be reviewed or undone from a backup.
+"""
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from db import SessionLocal
+from pipeline_lock import pipeline_lock
+from datetime import datetime
+import argparse
+import csv
+import sys
+
+
+def find_collisions(db) -> list:
+    """(datestamp, affiliation_id, content_hash, speech_ids) per shared fingerprint, oldest id first."""
+    return db.execute(text(
+        "SELECT datestamp, affiliation_id, content_hash, array_agg(speech_id ORDER BY speech_id) AS ids "
+        "FROM speeches WHERE content_hash IS NOT NULL "
+        "GROUP BY datestamp, affiliation_id, content_hash HAVING count(*) > 1 "
+        "ORDER BY datestamp, affiliation_id"
+    )).all()
+
+
+def write_report(path: str, groups: list):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["removed_speech_id", "kept_speech_id", "datestamp", "affiliation_id", "content_hash"])
+        for g in groups:
+            for speech_id in g.ids[1:]:
+                writer.writerow([speech_id, g.ids[0], g.datestamp.isoformat(), g.affiliation_id, g.content_hash])
+
+
+def dedupe_speech_fingerprints(delete: bool, report_path: str) -> int:
+    db = SessionLocal()
+    try:
+        groups = find_collisions(db)
+        for g in groups:
+            print(f"📝 {g.datestamp} affiliation {g.affiliation_id}: keep {g.ids[0]}, duplicates {g.ids[1:]}")
+        duplicates = [speech_id for g in groups for speech_id in g.ids[1:]]
+        if not duplicates:
+            print("✅ No speeches share a fingerprint.")
+            return 0
+        if not delete:
+            print(f"ℹ️ {len(duplicates)} duplicate speeches in {len(groups)} groups; rerun with --delete to remove them.")
+            return 0
+
+        # Written before the delete, so the record exists even if the delete fails
+        write_report(report_path, groups)
+        removed = db.execute(
+            text("DELETE FROM speeches WHERE speech_id = ANY(:ids)"), {"ids": duplicates}
+        ).rowcount
+        db.commit()
+        print(f"✅ Removed {removed} duplicate speeches; removed and kept ids written to {report_path}")
+        return removed
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report, and optionally remove, speeches that share a fingerprint.")
+    parser.add_argument("--delete", action="store_true", help="remove every duplicate but the oldest")
+    parser.add_argument(
+        "--report", default=f"speech_fingerprint_duplicates-{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv",
+        help="CSV of removed and kept speech ids, written with --delete",
+    )
+    args = parser.parse_args()
+
+    with pipeline_lock() as acquired:
+        if not acquired:
+            print("⚠️ An ingestion run holds the pipeline lock; try again once it has finished.")
+            sys.exit(1)
+        try:
+            dedupe_speech_fingerprints(args.delete, args.report)
+        except (SQLAlchemyError, OSError) as e:
+            print("❌ Deduplication failed:", e)
+            sys.exit(1)
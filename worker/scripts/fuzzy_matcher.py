@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+from rapidfuzz import process, fuzz
+
+
+class FuzzyMatcher:
+    """
+    Matches normalized labels against a fixed list of choices.
+
+    Distinct labels are scored together with `process.cdist` and every result,
+    including misses, is kept in an LRU memo, so each label is fuzzy-matched
+    at most once per run no matter how many sittings it appears in.
+    """
+
+    def __init__(
+        self,
+        choices: Iterable[str],
+        scorer: Callable = fuzz.ratio,
+        score_cutoff: int = 75,
+        fallback_scorer: Optional[Callable] = None,
+        fallback_cutoff: int = 0,
+        maxsize: int = 8192,
+        workers: int = -1,
+    ):
+        self.choices = list(choices)
+        self.scorer = scorer
+        self.score_cutoff = score_cutoff
+        self.fallback_scorer = fallback_scorer
+        self.fallback_cutoff = fallback_cutoff
+        self.maxsize = maxsize
+        self.workers = workers
+        # Outcomes of match(), memoized or not
+        self.matched = 0
+        self.unmatched = 0
+        self._memo: OrderedDict[str, Optional[str]] = OrderedDict()
+
+    def _best(self, labels: list[str], scorer: Callable, cutoff: int) -> list[Optional[str]]:
+        scores = process.cdist(labels, self.choices, scorer=scorer, score_cutoff=cutoff, workers=self.workers)
+        best = scores.argmax(axis=1)
+        return [
+            self.choices[idx] if row[idx] and row[idx] >= cutoff else None
+            for idx, row in zip(best, scores)
+        ]
+
+    def _remember(self, label: str, match: Optional[str]):
+        self._memo[label] = match
+        self._memo.move_to_end(label)
+        if len(self._memo) > self.maxsize:
+            self._memo.popitem(last=False)
+
+    def prime(self, labels: Iterable[str]):
+        """
+        Score every label that is not memoized yet in one batched pass.
+        """
+        pending = [label for label in dict.fromkeys(labels) if label and label not in self._memo]
+        if not pending:
+            return
+        if not self.choices:
+            for label in pending:
+                self._remember(label, None)
+            return
+
+        matches = self._best(pending, self.scorer, self.score_cutoff)
+        if self.fallback_scorer:
+            unmatched = [label for label, match in zip(pending, matches) if match is None]
+            if unmatched:
+                fallback = dict(zip(unmatched, self._best(unmatched, self.fallback_scorer, self.fallback_cutoff)))
+                matches = [match or fallback[label] for label, match in zip(pending, matches)]
+
+        for label, match in zip(pending, matches):
+            self._remember(label, match)
+
+    def match(self, label: str) -> Optional[str]:
+        if label in self._memo:
+            self._memo.move_to_end(label)
+            result = self._memo[label]
+        else:
+            self.prime([label])
+            result = self._memo.get(label)
+        if result is None:
+            self.unmatched += 1
+        else:
+            self.matched += 1
+        return result
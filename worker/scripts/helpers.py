@@ -1,3 +1,5 @@
+import unicodedata
+
 def clean_name(raw_name: str) -> str:
     """
     Remove prefix like 'Парламентарна група (на)' from the name.
@@ -9,4 +11,7 @@ def clean_name(raw_name: str) -> str:
         cleaned = cleaned.replace("Парламентарна група ", "")
     cleaned = cleaned.replace('\\"', '"')
     cleaned = cleaned.replace('"', '')
-    return cleaned.strip(' "')
\ No newline at end of file
+    return cleaned.strip(' "')
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text.strip().lower())
@@ -0,0 +1,217 @@
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+import os
+import random
+import threading
+import time
+import requests
+from pipeline_metrics import FETCH_SECONDS
+
+API_BASE_URL = "https://www.parliament.bg/api/v1"
+HEADERS = {
+    "User-Agent": "Parliametrics/0.1 (mihail.chifligarov@ruhr-uni-bochum.de)"
+}
+
+# Status codes worth another attempt; everything else in 4xx fails fast
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    not_modified: int = 0
+    retries: int = 0
+    errors: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.seconds / self.requests if self.requests else 0.0
+
+
+class _HostLimiter:
+    """
+    Caps the concurrent requests to one host and spaces their starts so
+    no more than `rate` requests per second are sent.
+    """
+
+    def __init__(self, max_concurrent: int, rate: float):
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.slots.acquire()
+        if self.interval:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self.interval
+            if start > now:
+                time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc):
+        self.slots.release()
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ParliamentClient:
+    """
+    One pooled, rate-limited HTTP client for everything the worker fetches
+    from parliament.bg. Safe to share between threads.
+
+    `get` retries connection errors and RETRYABLE_STATUS responses with full-jitter
+    exponential backoff (honouring Retry-After) and records latency and bytes per
+    endpoint label, so a run can report where its time went.
+    """
+
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        max_per_host: int = 8,
+        rate_per_second: float = 10.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_per_host = max(1, max_per_host)
+        self.rate_per_second = rate_per_second
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_per_host, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.stats: dict[str, EndpointStats] = {}
+        self._limiters: dict[str, _HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _limiter(self, url: str) -> _HostLimiter:
+        host = urlsplit(url).netloc
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = _HostLimiter(self.max_per_host, self.rate_per_second)
+            return limiter
+
+    def _record(self, endpoint: str, **counts):
+        with self._lock:
+            stats = self.stats.setdefault(endpoint, EndpointStats())
+            for name, value in counts.items():
+                setattr(stats, name, getattr(stats, name) + value)
+
+    def _delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        retry_after = _retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def get(self, url: str, endpoint: str = "other", headers: Optional[dict] = None) -> requests.Response:
+        """
+        GET with retries. Returns 2xx and 304 responses; anything else raises
+        requests.HTTPError (or the last connection error) once retries run out.
+        """
+        limiter = self._limiter(url)
+        for attempt in range(self.retries + 1):
+            started = time.perf_counter()
+            response = None
+            try:
+                with limiter:
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+                    body_size = len(response.content)
+            except (requests.ConnectionError, requests.Timeout):
+                FETCH_SECONDS.labels(endpoint, "error").observe(time.perf_counter() - started)
+                self._record(endpoint, requests=1, errors=1, seconds=time.perf_counter() - started)
+                if attempt >= self.retries:
+                    raise
+                self._record(endpoint, retries=1)
+                time.sleep(self._delay(attempt))
+                continue
+
+            FETCH_SECONDS.labels(endpoint, str(response.status_code)).observe(time.perf_counter() - started)
+            self._record(
+                endpoint, requests=1, bytes=body_size, seconds=time.perf_counter() - started,
+                not_modified=int(response.status_code == 304),
+            )
+            if response.status_code in RETRYABLE_STATUS and attempt < self.retries:
+                self._record(endpoint, retries=1)
+                time.sleep(self._delay(attempt, response))
+                continue
+            if response.status_code != 304:
+                if response.status_code >= 400:
+                    self._record(endpoint, errors=1)
+                response.raise_for_status()
+            return response
+
+    def get_conditional(
+        self,
+        url: str,
+        endpoint: str = "other",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> requests.Response:
+        """GET that may come back 304 when the given validators still match."""
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return self.get(url, endpoint=endpoint, headers=headers)
+
+    def report(self):
+        with self._lock:
+            items = sorted(self.stats.items())
+        for endpoint, s in items:
+            print(f"📈 {endpoint}: {s.requests} requests ({s.not_modified} not modified, {s.retries} retried, "
+                  f"{s.errors} failed), {s.bytes / 1024:.0f} KiB, {s.mean_latency * 1000:.0f} ms avg")
+
+
+_shared_client: Optional[ParliamentClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_client() -> ParliamentClient:
+    """
+    Process-wide client configured from PARLIAMENT_MAX_PER_HOST,
+    PARLIAMENT_RATE_LIMIT, PARLIAMENT_TIMEOUT and PARLIAMENT_RETRIES.
+    """
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = ParliamentClient(
+                max_per_host=int(os.getenv("PARLIAMENT_MAX_PER_HOST", "8")),
+                rate_per_second=float(os.getenv("PARLIAMENT_RATE_LIMIT", "10")),
+                read_timeout=float(os.getenv("PARLIAMENT_TIMEOUT", "30")),
+                retries=int(os.getenv("PARLIAMENT_RETRIES", "3")),
+            )
+        return _shared_client
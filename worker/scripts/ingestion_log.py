@@ -0,0 +1,126 @@
+from sqlalchemy import select, func, case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from models import IngestionLog, Speech
+from db import SessionLocal
+from datetime import date, datetime, timezone
+from typing import Optional, Tuple
+import os
+
+FALLBACK_START_DATE = date(2025, 1, 1)
+# A sitting that has failed this many times is quarantined: later runs skip it
+# instead of restarting from it and failing on it again
+MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def mark_running(db: Session, t_id: int, sitting_date: date):
+    stmt = insert(IngestionLog).values(
+        t_id=t_id, sitting_date=sitting_date, status="running", attempts=1, started_at=_now()
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[IngestionLog.t_id],
+        set_={
+            "status": "running",
+            "attempts": IngestionLog.attempts + 1,
+            "started_at": stmt.excluded.started_at,
+            "finished_at": None,
+            "error": None,
+        },
+    ))
+
+
+def mark_complete(db: Session, t_id: int, parsed: int, inserted: int, skipped: int):
+    """Called inside the sitting's own transaction, so the log and the rows commit together."""
+    db.query(IngestionLog).filter_by(t_id=t_id).update({
+        "status": "complete",
+        "finished_at": _now(),
+        "rows_parsed": parsed,
+        "rows_inserted": inserted,
+        "rows_skipped": skipped,
+    })
+
+
+def mark_failed(t_id: int, sitting_date: date, error: str) -> str:
+    """
+    Record a failed attempt and return the new status, failed or quarantined.
+    Failures during fetch or resolution never reached mark_running, so the
+    attempt is counted here unless the entry is still marked running.
+    """
+    # The sitting's own transaction has been rolled back, so record this separately
+    db = SessionLocal()
+    try:
+        stmt = insert(IngestionLog).values(
+            t_id=t_id, sitting_date=sitting_date, status="quarantined" if MAX_ATTEMPTS <= 1 else "failed",
+            attempts=1, started_at=_now(), finished_at=_now(), error=error
+        )
+        attempts = case((IngestionLog.status == "running", IngestionLog.attempts), else_=IngestionLog.attempts + 1)
+        status = db.execute(stmt.on_conflict_do_update(
+            index_elements=[IngestionLog.t_id],
+            set_={
+                "status": case((attempts >= MAX_ATTEMPTS, "quarantined"), else_="failed"),
+                "attempts": attempts,
+                "finished_at": stmt.excluded.finished_at,
+                "error": error,
+            },
+        ).returning(IngestionLog.status)).scalar_one()
+        db.commit()
+        return status
+    finally:
+        db.close()
+
+
+def mark_rebuilt(db: Session, entries: list[dict]):
+    """Mark sittings regenerated by rebuild_speeches as complete, in the swap transaction."""
+    if not entries:
+        return
+    stmt = insert(IngestionLog).values([
+        {**entry, "status": "complete", "attempts": 1, "started_at": entry["finished_at"], "error": None}
+        for entry in entries
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[IngestionLog.t_id],
+        set_={
+            "status": "complete",
+            "finished_at": stmt.excluded.finished_at,
+            "rows_parsed": stmt.excluded.rows_parsed,
+            "rows_inserted": stmt.excluded.rows_inserted,
+            "rows_skipped": stmt.excluded.rows_skipped,
+            "error": None,
+        },
+    ))
+
+
+def quarantined_sittings(db: Session) -> list[IngestionLog]:
+    return db.query(IngestionLog).filter_by(status="quarantined").order_by(IngestionLog.sitting_date).all()
+
+
+def resume_point(db: Session) -> Tuple[date, set[int]]:
+    """
+    Where the next run starts: the earliest sitting that is neither complete
+    nor quarantined, otherwise the last one logged. Returns that date and the
+    t_ids not to fetch again (complete or quarantined), so sittings sharing
+    the date are not redone.
+    """
+    settled = ("complete", "quarantined")
+    completed = set(db.execute(select(IngestionLog.t_id).where(IngestionLog.status.in_(settled))).scalars())
+    first_open: Optional[date] = db.execute(
+        select(func.min(IngestionLog.sitting_date)).where(IngestionLog.status.not_in(settled))
+    ).scalar()
+    if first_open:
+        return first_open, completed
+
+    last_complete: Optional[date] = db.execute(select(func.max(IngestionLog.sitting_date))).scalar()
+    if last_complete:
+        return last_complete, completed
+
+    # Databases filled before the log existed only know their last speech date
+    last_speech = db.execute(select(func.max(Speech.datestamp))).scalar()
+    if last_speech:
+        return last_speech, completed
+
+    print(f"⚠️ No speeches in DB. Using fallback date: {FALLBACK_START_DATE}")
+    return FALLBACK_START_DATE, completed
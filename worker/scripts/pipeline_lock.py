@@ -0,0 +1,26 @@
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import text
+from db import engine
+
+# Arbitrary application-wide key for pg_try_advisory_lock; one per pipeline
+PIPELINE_LOCK_KEY = 7_203_514
+
+
+@contextmanager
+def pipeline_lock(key: int = PIPELINE_LOCK_KEY) -> Iterator[bool]:
+    """
+    Session-level Postgres advisory lock around a pipeline run. Yields False
+    straight away if another process holds it, instead of queueing behind it.
+
+    The lock lives on its own autocommit connection, so it is never held by an
+    idle transaction and is released even if the job's session rolls back.
+    Postgres also drops it if this process dies.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
@@ -0,0 +1,61 @@
+"""
+Prometheus counters for the ingestion pipeline.
+
+The worker daemon serves them on WORKER_METRICS_PORT. One-shot scripts can
+write them to WORKER_METRICS_FILE on exit, e.g. for node_exporter's textfile
+collector. Code running in pool processes must not record here directly,
+because those processes have their own registries. It returns its numbers
+instead (see ResolveStats) and the parent records them.
+"""
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY, start_http_server, write_to_textfile
+import os
+
+FETCH_SECONDS = Histogram(
+    "parliament_fetch_seconds", "parliament.bg request latency per attempt", ["endpoint", "status"],
+)
+PARSE_SECONDS = Histogram("stenogram_parse_seconds", "Time to split one stenogram into turns")
+RESOLVE_SECONDS = Histogram("sitting_resolve_seconds", "Time to parse and attribute every turn of one sitting")
+FUZZY_LOOKUPS = Counter(
+    "fuzzy_match_lookups_total", "Fuzzy lookups of labels without an exact match", ["matcher", "result"],
+)
+AFFILIATION_CACHE = Counter(
+    "affiliation_cache_lookups_total", "SlidingAffiliationCache lookups for unannotated turns", ["result"],
+)
+SITTING_ROWS = Histogram(
+    "sitting_rows_written", "Speeches inserted per sitting",
+    buckets=(0, 10, 25, 50, 100, 200, 400, 800, 1600),
+)
+SPEECHES_WRITTEN = Counter("speeches_written_total", "Speeches written by ingestion", ["result"])
+SITTING_WRITE_SECONDS = Histogram("sitting_write_seconds", "Time to store one sitting, stats and version bump included")
+QUARANTINED_SITTINGS = Gauge(
+    "ingestion_quarantined_sittings", "Sittings skipped by ingestion after failing INGEST_MAX_ATTEMPTS times",
+)
+SPEECHES_PROCESSED = Counter("speeches_processed_total", "Speeches given text metrics by process_speeches")
+JOB_SECONDS = Histogram(
+    "worker_job_seconds", "Duration of worker daemon jobs", ["job", "status"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+
+
+def observe_resolution(stats):
+    """Record a ResolveStats, wherever the sitting was resolved."""
+    PARSE_SECONDS.observe(stats.parse_seconds)
+    RESOLVE_SECONDS.observe(stats.resolve_seconds)
+    for matcher, (matched, unmatched) in stats.fuzzy.items():
+        FUZZY_LOOKUPS.labels(matcher, "hit").inc(matched)
+        FUZZY_LOOKUPS.labels(matcher, "miss").inc(unmatched)
+    AFFILIATION_CACHE.labels("hit").inc(stats.cache_hits)
+    AFFILIATION_CACHE.labels("miss").inc(stats.cache_misses)
+
+
+def start_metrics_server():
+    port = os.getenv("WORKER_METRICS_PORT")
+    if port:
+        start_http_server(int(port))
+        print(f"📈 Metrics on :{port}/metrics")
+
+
+def write_metrics_file():
+    path = os.getenv("WORKER_METRICS_FILE")
+    if path:
+        write_to_textfile(path, REGISTRY)
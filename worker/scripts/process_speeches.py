@@ -0,0 +1,136 @@
+"""
+Processing stage: derives text metrics for every speech that is not processed yet.
+
+    python process_speeches.py [--batch-size 500] [--processes 4] [--max-batches N]
+
+Any number of these can run side by side, in other containers or on other hosts.
+Each claims its batch with FOR UPDATE SKIP LOCKED, so they split the backlog
+without coordinating and never block on each other's rows.
+"""
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from datetime import datetime, timezone
+from typing import Optional
+from db import SessionLocal
+from models import Speech, SpeechMetrics
+from pipeline_metrics import SPEECHES_PROCESSED
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+
+# Words, keeping hyphenated and apostrophised compounds together
+TOKEN_RE = re.compile(r"\w+(?:[-'’]\w+)*")
+# Abbreviations such as "г." also end a "sentence"; good enough for relative comparisons
+SENTENCE_END_RE = re.compile(r"[.!?…]+(?=\s|$)")
+
+METRIC_COLUMNS = ("tokens", "types", "sentences", "type_token_ratio", "normalized_text", "processed_at")
+
+
+def normalize_text(text: str) -> str:
+    """NFKC-normalized, lower-cased, one space between words."""
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+def speech_metrics(text: Optional[str]) -> dict:
+    normalized = normalize_text(text or "")
+    tokens = TOKEN_RE.findall(normalized)
+    types = len(set(tokens))
+    return {
+        "tokens": len(tokens),
+        "types": types,
+        "sentences": sum(1 for part in SENTENCE_END_RE.split(normalized) if TOKEN_RE.search(part)),
+        "type_token_ratio": types / len(tokens) if tokens else 0.0,
+        "normalized_text": normalized,
+    }
+
+
+def claim_batch(db: Session, batch_size: int) -> list:
+    """Lock the next unprocessed speeches, skipping rows another processor has claimed."""
+    return db.execute(
+        select(Speech.speech_id, Speech.speech_content)
+        .where(Speech.processed.isnot(True))
+        .order_by(Speech.speech_id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def process_batch(db: Session, batch_size: int, pool: Optional[ProcessPoolExecutor] = None, processes: int = 1) -> int:
+    """Claim, compute and store one batch in a single transaction; returns its size (0 once the backlog is empty)."""
+    rows = claim_batch(db, batch_size)
+    if not rows:
+        db.rollback()
+        return 0
+
+    ids = [row.speech_id for row in rows]
+    texts = [row.speech_content for row in rows]
+    if pool:
+        metrics = list(pool.map(speech_metrics, texts, chunksize=max(1, len(texts) // (processes * 4))))
+    else:
+        metrics = [speech_metrics(text) for text in texts]
+
+    now = datetime.now(timezone.utc)
+    stmt = insert(SpeechMetrics).values([
+        {"speech_id": speech_id, **values, "processed_at": now} for speech_id, values in zip(ids, metrics)
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[SpeechMetrics.speech_id],
+        set_={column: stmt.excluded[column] for column in METRIC_COLUMNS},
+    ))
+    db.execute(update(Speech).where(Speech.speech_id.in_(ids)).values(processed=True))
+    db.commit()
+    SPEECHES_PROCESSED.inc(len(ids))
+    return len(ids)
+
+
+def process_speeches(batch_size: int = 500, processes: int = 1, max_batches: Optional[int] = None) -> int:
+    """Work through the backlog until it is empty (or `max_batches` are done); returns the speeches processed."""
+    db = SessionLocal()
+    pool = ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn")) if processes > 1 else None
+    total = batches = 0
+    started = time.perf_counter()
+    try:
+        while max_batches is None or batches < max_batches:
+            batch_started = time.perf_counter()
+            count = process_batch(db, batch_size, pool, processes)
+            if not count:
+                break
+            batches += 1
+            total += count
+            elapsed = time.perf_counter() - batch_started
+            print(f"📝 Batch {batches}: {count} speeches in {elapsed:.2f}s ({count / elapsed:.0f}/s)")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    if total:
+        print(f"📈 Processed {total} speeches in {elapsed:.1f}s ({total / elapsed:.0f} speeches/s)")
+    else:
+        print("ℹ️ No unprocessed speeches.")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute text metrics for unprocessed speeches.")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("PROCESS_BATCH_SIZE", "500")))
+    parser.add_argument("--processes", type=int, default=int(os.getenv("PROCESS_PROCESSES", str(os.cpu_count() or 1))))
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches instead of draining the backlog")
+    args = parser.parse_args()
+
+    try:
+        process_speeches(args.batch_size, args.processes, args.max_batches)
+    except SQLAlchemyError as e:
+        print("❌ Database error:", e)
+        sys.exit(1)
@@ -0,0 +1,180 @@
+from sqlalchemy import Table, Column, Integer, MetaData, UniqueConstraint, delete, text
+from sqlalchemy.exc import SQLAlchemyError
+from db import SessionLocal
+from models import Speech, Sitting
+from data_version import bump_data_version
+from speech_stats import refresh_speech_stats
+from api_archive import ApiArchive, ArchiveMiss
+from stenogram_fetcher import StenogramFetcher, StenogramFetchError
+from http_client import API_BASE_URL
+from speech_resolution import SittingResolutionError, take_snapshot
+from speech_writer import BulkSpeechWriter, FallbackAffiliations
+from seed_speeches import resolve_sittings, get_infos_from_parliament_db
+from ingestion_log import mark_rebuilt
+from pipeline_lock import pipeline_lock
+from datetime import date, datetime, timezone
+import argparse
+import os
+import sys
+import time
+import traceback
+
+STAGING_TABLE = "speeches_staging"
+
+
+def staging_table() -> Table:
+    """
+    Unlogged copy of the speeches layout. `staging_id` keeps the original
+    turn order so the swap can insert rows in the order they were spoken.
+    """
+    columns = [
+        Column(c.name, c.type, nullable=c.nullable)
+        for c in Speech.__table__.columns
+        if not c.primary_key and c.computed is None
+    ]
+    return Table(
+        STAGING_TABLE, MetaData(),
+        Column("staging_id", Integer, primary_key=True),
+        *columns,
+        UniqueConstraint("datestamp", "affiliation_id", "content_hash"),
+        prefixes=["UNLOGGED"],
+    )
+
+
+def archived_seatings(archive: ApiArchive, date_from: date, date_to: date) -> list[dict]:
+    seatings = []
+    year, month = date_from.year, date_from.month
+    while (year, month) <= (date_to.year, date_to.month):
+        url = f"{API_BASE_URL}/archive-period/bg/Pl_StenV/{year}/{month}/0/0"
+        response = archive.get("archive-period", f"{year}-{month:02}", url)
+        seatings += [s for s in response.json() if date_from <= date.fromisoformat(s["t_date"]) <= date_to]
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return sorted(seatings, key=lambda s: (s["t_date"], s["t_id"]))
+
+
+# A staged row is the same speech as a live one when their fingerprints match
+SAME_SPEECH = (
+    "s.datestamp = st.datestamp AND s.affiliation_id = st.affiliation_id AND s.content_hash = st.content_hash"
+)
+
+
+def swap_in(db, staging: Table, date_from: date, date_to: date, log_entries: list[dict]) -> tuple[int, int, int]:
+    """
+    Bring the live rows of the date range in line with the staged ones in a
+    single transaction; readers keep seeing the old rows until the commit.
+    Speeches whose fingerprint survives keep their speech_id (so links and
+    cursors stay valid) and their text metrics, unless their text changed.
+    Returns the speeches updated, removed and added.
+    """
+    columns = ", ".join(c.name for c in staging.columns if c.name != "staging_id")
+    in_range = {"date_from": date_from, "date_to": date_to}
+    # Block concurrent ingestion into the range, but not readers
+    db.execute(text("LOCK TABLE speeches IN SHARE ROW EXCLUSIVE MODE"))
+    updated = db.execute(text(f"""
+        UPDATE speeches s SET
+            speech_content = st.speech_content,
+            from_tribune = st.from_tribune,
+            is_continuation = st.is_continuation,
+            processed = s.processed AND s.speech_content IS NOT DISTINCT FROM st.speech_content
+        FROM {STAGING_TABLE} st
+        WHERE {SAME_SPEECH} AND s.datestamp BETWEEN :date_from AND :date_to
+          AND (s.speech_content, s.from_tribune, s.is_continuation)
+              IS DISTINCT FROM (st.speech_content, st.from_tribune, st.is_continuation)
+    """), in_range).rowcount
+    removed = db.execute(text(f"""
+        DELETE FROM speeches s
+        WHERE s.datestamp BETWEEN :date_from AND :date_to
+          AND NOT EXISTS (SELECT 1 FROM {STAGING_TABLE} st WHERE {SAME_SPEECH})
+    """), in_range).rowcount
+    added = db.execute(text(f"""
+        INSERT INTO speeches ({columns})
+        SELECT {columns} FROM {STAGING_TABLE} st
+        WHERE NOT EXISTS (SELECT 1 FROM speeches s WHERE {SAME_SPEECH})
+        ORDER BY staging_id
+    """)).rowcount
+    db.execute(delete(Sitting).where(Sitting.sitting_date.between(date_from, date_to)))
+    db.execute(text(f"INSERT INTO sittings (sitting_date) SELECT DISTINCT datestamp FROM {STAGING_TABLE}"))
+    refresh_speech_stats(db, date_from, date_to)
+    mark_rebuilt(db, log_entries)
+    bump_data_version(db)
+    staging.drop(db.connection())
+    db.commit()
+    return updated, removed, added
+
+
+def rebuild_speeches(date_from: date, date_to: date, processes: int = 1, online: bool = False):
+    started = time.perf_counter()
+    archive = ApiArchive(offline=not online)
+    fetcher = StenogramFetcher(archive=archive, max_in_flight=max(processes, 4))
+    staging = staging_table()
+    db = SessionLocal()
+    try:
+        parties, affiliations, _, _ = get_infos_from_parliament_db()
+        party_snapshot, affiliation_snapshot = take_snapshot(parties, affiliations)
+
+        seatings = archived_seatings(archive, date_from, date_to)
+        print(f"🔁 Rebuilding {len(seatings)} sittings between {date_from} and {date_to}")
+
+        staging.drop(db.connection(), checkfirst=True)
+        staging.create(db.connection())
+        db.commit()
+
+        writer = BulkSpeechWriter(db, table=staging)
+        fallbacks = FallbackAffiliations(db)
+        log_entries = []
+        for seating, speeches in resolve_sittings(
+            fetcher.fetch_all(seatings), party_snapshot, affiliation_snapshot, processes
+        ):
+            sitting_date = date.fromisoformat(seating["t_date"])
+            for speech in speeches:
+                writer.add(
+                    speech_content=speech.speech_content,
+                    datestamp=sitting_date,
+                    affiliation_id=speech.affiliation_id or fallbacks.affiliation_id_for(speech.fallback_name),
+                    from_tribune=speech.from_tribune,
+                    is_continuation=speech.is_continuation
+                )
+            inserted, skipped = writer.flush()
+            db.commit()
+            log_entries.append({
+                "t_id": seating["t_id"],
+                "sitting_date": sitting_date,
+                "rows_parsed": len(speeches),
+                "rows_inserted": inserted,
+                "rows_skipped": skipped,
+                "finished_at": datetime.now(timezone.utc),
+            })
+
+        updated, removed, added = swap_in(db, staging, date_from, date_to, log_entries)
+        print(f"✅ Swapped in the rebuild: {added} speeches added, {updated} updated, {removed} removed "
+              f"in {time.perf_counter() - started:.1f}s")
+
+    except (ArchiveMiss, StenogramFetchError, SittingResolutionError) as e:
+        db.rollback()
+        print(f"❌ {e}")
+        print("ℹ️ Live speeches were left untouched. Use --online to fetch records missing from the archive.")
+        sys.exit(1)
+    except SQLAlchemyError as e:
+        db.rollback()
+        print("❌ Database error:", e)
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Regenerate speeches for a date range from the local parliament.bg archive."
+    )
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--online", action="store_true", help="fetch records that are missing from the archive")
+    args = parser.parse_args()
+
+    with pipeline_lock() as acquired:
+        if not acquired:
+            print("⚠️ An ingestion run holds the pipeline lock; try again once it has finished.")
+            sys.exit(1)
+        rebuild_speeches(args.date_from, args.date_to, args.processes, args.online)
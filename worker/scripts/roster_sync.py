@@ -0,0 +1,328 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, Optional
+from db import SessionLocal
+from models import Party, Speaker, SpeakerPartyAffiliation
+from helpers import clean_name
+from data_version import bump_data_version
+from api_archive import ApiArchive, ArchiveMiss, period_is_open
+from http_client import API_BASE_URL, get_client
+import requests
+
+# Optional: manual overrides for abbreviation
+known_abbreviations = {
+    "ГЕРБ – СДС": "ГЕРБ-СДС",
+    "Продължаваме Промяната – Демократична България": "ПП-ДБ",
+    "ВЪЗРАЖДАНЕ": "ВЪЗРАЖДАНЕ",
+    "Движение за права и свободи – Ново начало – ДПС – Ново начало": "Демокрация, права и свободи – ДПС",
+    "БСП – ОБЕДИНЕНА ЛЕВИЦА": "БСП",
+    "Има Такъв Народ": "ИТН",
+    "Алианс за права и свободи": "АПС",
+    "ПП МЕЧ": "МЕЧ",
+    "ВЕЛИЧИЕ": "ВЕЛИЧИЕ",
+    "Нечленуващи в ПГ": "Без ПГ"
+}
+
+# Parties without an API id that stand in for procedural roles
+SPECIAL_ROLE_PARTIES = ["ПРЕДСЕДАТЕЛ", "МИНИСТЪР", "ДОКЛАДЧИК"]
+
+# Speakers for those roles, attached to the role parties by id
+FALLBACK_ROLES = [
+    {"party_id": 1, "name": "ПРЕДСЕДАТЕЛ"},
+    {"party_id": 2, "name": "МИНИСТЪР"},
+    {"party_id": 3, "name": "ДОКЛАДЧИК"}
+]
+
+# Keeps each INSERT well below Postgres' 65535 bind-parameter limit
+INSERT_CHUNK_SIZE = 1000
+
+
+class IncompleteGrid(RuntimeError):
+    """
+    Some (party, month) lists could not be fetched. Syncing without them would
+    read a missing month as "no longer a member" and rewrite end dates, so
+    the whole sync is abandoned instead.
+    """
+
+    def __init__(self, failed: list[tuple[str, int, int]]):
+        cells = ", ".join(f"{party} {year}-{month:02}" for party, year, month in failed)
+        super().__init__(f"{len(failed)} party/month lists could not be fetched: {cells}")
+        self.failed = failed
+
+
+@dataclass
+class Membership:
+    start_date: Optional[date]
+    end_date: Optional[date]
+    seen_in: tuple[int, int]  # (year, month) of the grid cell the dates came from
+
+
+def months_between(start: date, end: date) -> list[tuple[int, int]]:
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _chunks(rows: list, size: int = INSERT_CHUNK_SIZE) -> Iterable[list]:
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value or value == "9999-12-31":
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+class RosterSync:
+    """
+    Synchronizes parties, speakers and affiliations with parliament.bg.
+
+    The party-by-month `coll-list-mp` grid is fetched concurrently, MPs are
+    deduplicated in memory against preloaded dicts of what the DB already
+    holds, and each table is then written with a few set-based
+    INSERT ... ON CONFLICT statements.
+    """
+
+    def __init__(self, db: Session, archive: Optional[ApiArchive] = None, max_in_flight: int = 8):
+        self.db = db
+        self.archive = archive or ApiArchive()
+        self.max_in_flight = max_in_flight
+        self.changes = 0
+
+    # --- Parties ---
+
+    def sync_parties(self) -> int:
+        url = f"{API_BASE_URL}/coll-list/bg/2"
+        data = self.archive.get("coll-list", "bg-2", url, revalidate=True).json()
+
+        rows = {
+            name: {"party_name": name, "party_abbreviation": "", "party_api_id": None}
+            for name in SPECIAL_ROLE_PARTIES
+        }
+        self.db.execute(insert(Party).values(list(rows.values())).on_conflict_do_nothing(index_elements=[Party.party_name]))
+
+        api_rows = {}
+        for item in data:
+            name = clean_name(item["A_ns_CL_value"])
+            # First occurrence wins, as the API lists some groups more than once
+            api_rows.setdefault(name, {
+                "party_name": name,
+                "party_abbreviation": known_abbreviations.get(name, name.split()[-1]),
+                "party_api_id": item["A_ns_C_id"],
+            })
+
+        existing = dict(self.db.execute(select(Party.party_name, Party.party_api_id)).all())
+        changed = [
+            row for name, row in api_rows.items()
+            if name not in existing or existing[name] != row["party_api_id"]
+        ]
+        if changed:
+            stmt = insert(Party).values(changed)
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[Party.party_name],
+                set_={"party_api_id": stmt.excluded.party_api_id},
+            ))
+        added = sum(1 for row in changed if row["party_name"] not in existing)
+        self.changes += len(changed)
+        print(f"🏛️ Parties: {added} added, {len(changed) - added} API ids updated")
+        return len(changed)
+
+    # --- Members grid ---
+
+    def _fetch_cell(self, party_api_id: str, year: int, month: int) -> list[dict]:
+        url = f"{API_BASE_URL}/coll-list-mp/bg/{party_api_id}/2?date={year}-{month:02}-01"
+        key = f"{party_api_id}-{year}-{month:02}"
+        response = self.archive.get("coll-list-mp", key, url, revalidate=period_is_open(year, month))
+        return response.json().get("colListMP", [])
+
+    def fetch_grid(self, parties: list[Party], months: list[tuple[int, int]]) -> dict:
+        """
+        Fetch every (party, month) cell concurrently; returns {(party_id, year, month): [mp]}.
+        Raises IncompleteGrid once all cells are tried if any of them failed.
+        """
+        cells = [(p, year, month) for p in parties for year, month in months]
+
+        def fetch(cell):
+            party, year, month = cell
+            try:
+                return cell, self._fetch_cell(party.party_api_id, year, month)
+            except (requests.RequestException, ArchiveMiss, ValueError) as e:
+                print(f"❌ Failed to fetch party {party.party_name} for {year}-{month:02}: {e}")
+                return cell, None
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            results = list(pool.map(fetch, cells))
+        failed = [(p.party_name, y, m) for (p, y, m), mps in results if mps is None]
+        if failed:
+            raise IncompleteGrid(failed)
+        return {(p.party_id, y, m): mps for (p, y, m), mps in results}
+
+    @staticmethod
+    def collect_members(grid: dict) -> tuple[dict, dict]:
+        """
+        Deduplicate the grid in memory. Returns the distinct speakers keyed by
+        (first, middle, last) and their memberships keyed by (speaker key, party_id);
+        the earliest start date and the most recent month's end date win.
+        """
+        speakers = {}
+        memberships = {}
+        for (party_id, year, month), mps in grid.items():
+            for mp in mps:
+                first_name = mp["A_ns_MPL_Name1"].strip().title()
+                middle_name = mp["A_ns_MPL_Name2"].strip().title()
+                last_name = mp["A_ns_MPL_Name3"].strip().title()
+                key = (first_name, middle_name, last_name)
+                speakers.setdefault(key, f"{first_name} {last_name}")
+
+                start_date = _parse_date(mp["A_ns_MSP_date_F"])
+                end_date = _parse_date(mp.get("A_ns_MSP_date_T"))
+                current = memberships.get((key, party_id))
+                if current is None:
+                    memberships[(key, party_id)] = Membership(start_date, end_date, (year, month))
+                    continue
+                if start_date and (current.start_date is None or start_date < current.start_date):
+                    current.start_date = start_date
+                if (year, month) >= current.seen_in:
+                    current.end_date = end_date
+                    current.seen_in = (year, month)
+        return speakers, memberships
+
+    # --- Speakers and affiliations ---
+
+    def _speaker_ids(self) -> dict:
+        rows = self.db.execute(select(Speaker.speaker_id, Speaker.first_name, Speaker.middle_name, Speaker.last_name))
+        return {(first, middle, last): speaker_id for speaker_id, first, middle, last in rows}
+
+    def sync_speakers(self, speakers: dict) -> dict:
+        speaker_ids = self._speaker_ids()
+        missing = [
+            {"first_name": first, "middle_name": middle, "last_name": last, "speaker_name": name}
+            for (first, middle, last), name in speakers.items()
+            if (first, middle, last) not in speaker_ids
+        ]
+        for chunk in _chunks(missing):
+            self.db.execute(insert(Speaker).values(chunk).on_conflict_do_nothing(constraint="uq_full_speaker_name"))
+        if missing:
+            speaker_ids = self._speaker_ids()
+        self.changes += len(missing)
+        print(f"🧑 Speakers: {len(missing)} added, {len(speakers) - len(missing)} already known")
+        return speaker_ids
+
+    def sync_affiliations(self, memberships: dict, speaker_ids: dict) -> tuple[int, int]:
+        existing = {
+            (speaker_id, party_id): (start, end)
+            for speaker_id, party_id, start, end in self.db.execute(select(
+                SpeakerPartyAffiliation.speaker_speaker_id, SpeakerPartyAffiliation.party_party_id,
+                SpeakerPartyAffiliation.start_date, SpeakerPartyAffiliation.end_date,
+            ))
+        }
+
+        added = updated = 0
+        rows = []
+        for (speaker_key, party_id), membership in memberships.items():
+            pair = (speaker_ids[speaker_key], party_id)
+            if pair in existing:
+                start, end = existing[pair]
+                start_moves = membership.start_date and (start is None or membership.start_date < start)
+                if end == membership.end_date and not start_moves:
+                    continue
+                updated += 1
+            else:
+                added += 1
+            rows.append({
+                "speaker_speaker_id": pair[0],
+                "party_party_id": pair[1],
+                "start_date": membership.start_date,
+                "end_date": membership.end_date,
+            })
+
+        for chunk in _chunks(rows):
+            stmt = insert(SpeakerPartyAffiliation).values(chunk)
+            self.db.execute(stmt.on_conflict_do_update(
+                constraint="uq_speaker_party",
+                set_={
+                    "start_date": func.least(SpeakerPartyAffiliation.start_date, stmt.excluded.start_date),
+                    "end_date": stmt.excluded.end_date,
+                },
+            ))
+        self.changes += len(rows)
+        print(f"🔗 Affiliations: {added} added, {updated} updated")
+        return added, updated
+
+    def sync_fallback_roles(self):
+        self.db.execute(insert(Speaker).values([
+            {"speaker_name": role["name"], "first_name": "", "middle_name": "", "last_name": ""}
+            for role in FALLBACK_ROLES
+        ]).on_conflict_do_nothing(constraint="uq_full_speaker_name"))
+
+        role_ids = dict(self.db.execute(
+            select(Speaker.speaker_name, Speaker.speaker_id).where(
+                Speaker.speaker_name.in_([role["name"] for role in FALLBACK_ROLES]),
+                Speaker.first_name == "",
+            )
+        ).all())
+        party_ids = set(self.db.execute(
+            select(Party.party_id).where(Party.party_id.in_([role["party_id"] for role in FALLBACK_ROLES]))
+        ).scalars())
+
+        rows = []
+        for role in FALLBACK_ROLES:
+            if role["party_id"] not in party_ids:
+                print(f"❌ Missing fallback party: {role['name']}")
+                continue
+            rows.append({
+                "speaker_speaker_id": role_ids[role["name"]],
+                "party_party_id": role["party_id"],
+                "start_date": None,
+                "end_date": None,
+            })
+        if rows:
+            self.db.execute(insert(SpeakerPartyAffiliation).values(rows).on_conflict_do_nothing(constraint="uq_speaker_party"))
+
+    def sync_members(self, months: list[tuple[int, int]]):
+        parties = [p for p in self.db.query(Party).all() if p.party_api_id]
+        grid = self.fetch_grid(parties, months)
+        speakers, memberships = self.collect_members(grid)
+        print(f"📡 Fetched {len(grid)} party/month lists: {len(speakers)} distinct MPs, {len(memberships)} memberships")
+        speaker_ids = self.sync_speakers(speakers)
+        self.sync_affiliations(memberships, speaker_ids)
+
+
+def sync_roster(
+    months: list[tuple[int, int]],
+    parties: bool = True,
+    fallback_roles: bool = True,
+    max_in_flight: int = 8,
+) -> bool:
+    """Run a full roster sync in one transaction; returns False if it was rolled back."""
+    db = SessionLocal()
+    try:
+        sync = RosterSync(db, max_in_flight=max_in_flight)
+        if parties:
+            sync.sync_parties()
+        if fallback_roles:
+            sync.sync_fallback_roles()
+        if months:
+            sync.sync_members(months)
+        # Speakers and parties feed the API's filter options
+        if sync.changes:
+            bump_data_version(db)
+        db.commit()
+        print("✅ Roster sync done.")
+        return True
+    except (SQLAlchemyError, requests.RequestException, ArchiveMiss, IncompleteGrid) as e:
+        db.rollback()
+        print("❌ Error:", e)
+        return False
+    finally:
+        db.close()
+        get_client().report()
@@ -0,0 +1,57 @@
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from models import WorkerRun
+from db import SessionLocal
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def start_run(job: str) -> int:
+    """Record a run as started in its own transaction, so it is visible while the job works."""
+    db = SessionLocal()
+    try:
+        run = WorkerRun(job=job, status="running", started_at=_now())
+        db.add(run)
+        db.commit()
+        return run.run_id
+    finally:
+        db.close()
+
+
+def finish_run(run_id: int, status: str, rows: Optional[int] = None, error: Optional[str] = None):
+    db = SessionLocal()
+    try:
+        db.query(WorkerRun).filter_by(run_id=run_id).update({
+            "status": status,
+            "finished_at": _now(),
+            "rows": rows,
+            "error": error,
+        })
+        db.commit()
+    finally:
+        db.close()
+
+
+def abandon_stale_runs(db: Session) -> int:
+    """
+    Runs still marked running when the pipeline lock was free belong to a
+    worker that died; mark them failed so the history stays truthful.
+    """
+    count = db.query(WorkerRun).filter_by(status="running").update({
+        "status": "failed",
+        "finished_at": _now(),
+        "error": "worker exited before the run finished",
+    })
+    db.commit()
+    return count
+
+
+def last_successes(db: Session) -> dict[str, datetime]:
+    rows = db.execute(
+        select(WorkerRun.job, func.max(WorkerRun.finished_at)).where(WorkerRun.status == "success").group_by(WorkerRun.job)
+    )
+    return dict(rows.all())
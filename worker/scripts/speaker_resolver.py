@@ -0,0 +1,166 @@
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Optional
+from helpers import normalize
+
+
+def build_disambiguated_speaker_lookup(affiliations):
+    speaker_lookup = defaultdict(list)
+
+    for aff in affiliations:
+        s = aff.speaker
+        party_id = aff.party_party_id
+        start = aff.start_date
+        end = aff.end_date
+
+        names = {
+            f"{s.first_name} {s.middle_name}",
+            f"{s.first_name} {s.last_name}",
+            f"{s.middle_name} {s.last_name}",
+            f"{s.first_name} {s.middle_name} {s.last_name}",
+            s.speaker_name,
+            s.first_name,
+            s.middle_name,
+            s.last_name,
+        }
+
+        for name in names:
+            norm = normalize(name)
+            if norm:
+                speaker_lookup[norm].append((s, party_id, start, end))  # now 4-tuple
+
+    return speaker_lookup
+
+
+def _start_key(start: Optional[date]) -> date:
+    return start or date.min
+
+
+class DateTimeline:
+    """
+    Answers "which of these entries are valid on a day" with one bisect.
+
+    The date line is cut at every start date and every day after an end
+    date; validity cannot change inside a segment, so `pick` is applied once
+    per segment when the timeline is built and a lookup only finds the segment.
+    `entries` must be in start-date order; `pick` receives the valid ones in
+    that order.
+    """
+
+    def __init__(self, entries: list, start_of, end_of, pick):
+        cuts = {_start_key(start_of(e)) for e in entries}
+        cuts |= {end_of(e) + timedelta(days=1) for e in entries if end_of(e) and end_of(e) < date.max}
+        self._cuts = sorted(cuts)
+        self._answers = [
+            pick([e for e in entries
+                  if _start_key(start_of(e)) <= cut and (end_of(e) is None or cut <= end_of(e))])
+            for cut in self._cuts
+        ]
+        self._before = pick([])
+
+    def on(self, day: date):
+        i = bisect_right(self._cuts, day) - 1
+        return self._answers[i] if i >= 0 else self._before
+
+
+def _unique_speaker(valid: list):
+    return valid[0][0] if len(valid) == 1 else None
+
+
+def _latest_started(valid: list):
+    # Of the affiliations valid that day, the one that started last (the later one on a tie)
+    return valid[-1] if valid else None
+
+
+def _latest(entries: list, start_of):
+    # First entry with the greatest start date, matching the old sorted(..., reverse=True)[0]
+    best = None
+    for e in entries:
+        if best is None or _start_key(start_of(e)) > _start_key(start_of(best)):
+            best = e
+    return best
+
+
+class SpeakerResolver:
+    """
+    Index over the known speakers and affiliations, built once per run.
+
+    Names and (name, party) pairs map to date timelines of their candidates,
+    affiliations are keyed by (speaker_id, party_id) and get a timeline per
+    speaker_id, so resolving a speech turn costs a dict lookup and a bisect.
+    """
+
+    def __init__(self, affiliations):
+        self.speaker_lookup = build_disambiguated_speaker_lookup(affiliations)
+        self.speaker_names = list(self.speaker_lookup.keys())
+
+        candidate_start, candidate_end = (lambda c: c[2]), (lambda c: c[3])
+        self._latest_candidate = {}
+        self._candidates = {}
+        by_name_party = defaultdict(list)
+        for name, candidates in self.speaker_lookup.items():
+            self._latest_candidate[name] = _latest(candidates, candidate_start)
+            ordered = sorted(candidates, key=lambda c: _start_key(c[2]))
+            self._candidates[name] = DateTimeline(ordered, candidate_start, candidate_end, _unique_speaker)
+            for c in ordered:
+                by_name_party[(name, c[1])].append(c)
+        self._by_name_party = {
+            key: DateTimeline(entries, candidate_start, candidate_end, _unique_speaker)
+            for key, entries in by_name_party.items()
+        }
+
+        self._by_speaker_party = {}
+        by_speaker = defaultdict(list)
+        for aff in affiliations:
+            self._by_speaker_party.setdefault((aff.speaker_speaker_id, aff.party_party_id), aff)
+            by_speaker[aff.speaker_speaker_id].append(aff)
+        self._latest_by_speaker = {}
+        self._by_speaker = {}
+        for speaker_id, entries in by_speaker.items():
+            # Stable sort: affiliations starting on the same day keep their input order
+            ordered = sorted(entries, key=lambda a: _start_key(a.start_date))
+            self._latest_by_speaker[speaker_id] = _latest(ordered, lambda a: a.start_date)
+            self._by_speaker[speaker_id] = DateTimeline(
+                ordered, lambda a: a.start_date, lambda a: a.end_date, _latest_started
+            )
+
+    def candidates(self, norm_name: str) -> Optional[list]:
+        return self.speaker_lookup.get(norm_name)
+
+    def resolve_speaker(self, norm_name: str, party_id: Optional[int], speech_date: date):
+        """
+        Pick the speaker behind a normalized name: a unique candidate wins outright,
+        otherwise the party and the sitting date are used to disambiguate.
+        """
+        candidates = self.speaker_lookup.get(norm_name)
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0][0]
+        if party_id is None:
+            return None
+
+        indexed = self._by_name_party.get((norm_name, party_id))
+        if indexed:
+            exact = indexed.on(speech_date)
+            if exact:
+                return exact
+
+        valid = self._candidates[norm_name].on(speech_date)
+        if valid:
+            return valid
+        return self._latest_candidate[norm_name][0]
+
+    def affiliation_for(self, speaker_id: int, party_id: int):
+        return self._by_speaker_party.get((speaker_id, party_id))
+
+    def affiliation_on(self, speaker_id: int, speech_date: date):
+        """
+        The speaker's affiliation valid on `speech_date`, falling back to the
+        most recently started one.
+        """
+        timeline = self._by_speaker.get(speaker_id)
+        if timeline is None:
+            return None
+        return timeline.on(speech_date) or self._latest_by_speaker[speaker_id]
@@ -0,0 +1,301 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from multiprocessing import get_context
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from rapidfuzz import fuzz
+from helpers import normalize
+from fuzzy_matcher import FuzzyMatcher
+from speaker_resolver import SpeakerResolver
+from stenogram_parser import parse_stenogram
+from pipeline_metrics import observe_resolution
+import re
+import time
+
+FALLBACK_PARTY_ID = 9999
+FALLBACK_PARTY_NAME = "ВЪНШЕН"
+
+
+class SittingResolutionError(RuntimeError):
+    def __init__(self, message: str, seating: dict):
+        super().__init__(message)
+        self.seating = seating
+
+
+class SlidingAffiliationCache:
+    def __init__(self, max_age=4):
+        self._store = {}
+        self._history = deque(maxlen=max_age)
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, norm_speaker, affiliation):
+        self._store[norm_speaker] = affiliation
+        self._history.append(norm_speaker)
+        # Retain only recent speakers
+        recent = set(self._history)
+        self._store = {k: v for k, v in self._store.items() if k in recent}
+
+    def get(self, norm_speaker):
+        return self._store.get(norm_speaker)
+
+    def __contains__(self, norm_speaker):
+        found = norm_speaker in self._store
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found
+
+
+@dataclass
+class ResolveStats:
+    """Timings and cache outcomes of one resolve(); plain data, so pool workers can send it back."""
+    parse_seconds: float = 0.0
+    resolve_seconds: float = 0.0
+    fuzzy: dict = field(default_factory=dict)  # matcher -> (matched, unmatched)
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+# --- Read-only roster snapshot, cheap to pickle into worker processes ---
+
+@dataclass(frozen=True)
+class SpeakerSnapshot:
+    speaker_id: int
+    speaker_name: str
+    first_name: str
+    middle_name: str
+    last_name: str
+
+
+@dataclass(frozen=True)
+class PartySnapshot:
+    party_id: int
+    party_name: str
+    party_abbreviation: str
+
+
+@dataclass(frozen=True)
+class AffiliationSnapshot:
+    affiliation_id: int
+    speaker_speaker_id: int
+    party_party_id: int
+    start_date: Optional[date]
+    end_date: Optional[date]
+    speaker: SpeakerSnapshot
+
+
+def take_snapshot(parties, affiliations) -> Tuple[List[PartySnapshot], List[AffiliationSnapshot]]:
+    speakers = {}
+    for a in affiliations:
+        s = a.speaker
+        speakers.setdefault(s.speaker_id, SpeakerSnapshot(
+            s.speaker_id, s.speaker_name, s.first_name, s.middle_name, s.last_name
+        ))
+    party_snapshot = [PartySnapshot(p.party_id, p.party_name, p.party_abbreviation or "") for p in parties]
+    affiliation_snapshot = [
+        AffiliationSnapshot(
+            a.affiliation_id, a.speaker_speaker_id, a.party_party_id,
+            a.start_date, a.end_date, speakers[a.speaker.speaker_id]
+        )
+        for a in affiliations
+    ]
+    return party_snapshot, affiliation_snapshot
+
+
+# --- Pure resolution of one sitting ---
+
+class ResolvedSpeech(NamedTuple):
+    speech_content: str
+    from_tribune: bool
+    is_continuation: bool
+    # Exactly one of these is set; unknown speakers are reconciled by the writer
+    affiliation_id: Optional[int]
+    fallback_name: Optional[str]
+
+
+PARTY_LABEL_PATTERN = re.compile(r"^\(([^(),]+)")
+
+def party_label(annotation: str) -> Optional[str]:
+    match = PARTY_LABEL_PATTERN.search(annotation) if annotation else None
+    return normalize(match.group(1)) if match else None
+
+SPECIAL_ROLES = [
+    ("председател", 1, 1),
+    ("министър", 2, 2),
+    ("докладчик", 3, 3),
+]
+
+@lru_cache(maxsize=4096)
+def special_roles_for(norm_speaker: str) -> Tuple[Tuple[int, int], ...]:
+    return tuple((sid, pid) for keyword, sid, pid in SPECIAL_ROLES if fuzz.partial_ratio(keyword, norm_speaker) >= 85)
+
+
+class SittingResolver:
+    """
+    Parses a stenogram and attributes every turn to an affiliation without
+    touching the database, so it can run in any process given a roster snapshot.
+    """
+
+    def __init__(self, parties, affiliations, fuzzy_workers: int = -1):
+        self.resolver = SpeakerResolver(affiliations)
+        self.party_lookup = {normalize(p.party_name): p for p in parties}
+        self.abbrev_lookup = {normalize(p.party_abbreviation): p for p in parties}
+        party_names = list(self.party_lookup.keys()) + list(self.abbrev_lookup.keys())
+
+        self.speaker_matcher = FuzzyMatcher(self.resolver.speaker_names, workers=fuzzy_workers)
+        self.party_matcher = FuzzyMatcher(
+            party_names, fallback_scorer=fuzz.partial_ratio, fallback_cutoff=80, workers=fuzzy_workers
+        )
+        self.last_stats = ResolveStats()
+
+    def _party_for(self, raw_party: Optional[str]):
+        if not raw_party:
+            return None
+        party = self.party_lookup.get(raw_party) or self.abbrev_lookup.get(raw_party)
+        if not party:
+            fuzzy = self.party_matcher.match(raw_party)
+            if fuzzy:
+                party = self.party_lookup.get(fuzzy) or self.abbrev_lookup.get(fuzzy)
+        return party
+
+    def resolve(self, steno_text: str, speech_date: date) -> List[ResolvedSpeech]:
+        started = time.perf_counter()
+        speeches = list(parse_stenogram(steno_text))
+        parse_seconds = time.perf_counter() - started
+        resolver = self.resolver
+        matchers = {"speaker": self.speaker_matcher, "party": self.party_matcher}
+        before = {name: (m.matched, m.unmatched) for name, m in matchers.items()}
+
+        # Score every unresolved label of this stenogram in one batch
+        self.speaker_matcher.prime(
+            norm for norm in (normalize(turn.raw_speaker) for turn in speeches)
+            if not resolver.candidates(norm)
+        )
+        self.party_matcher.prime(
+            label for label in (party_label(turn.annotation) for turn in speeches)
+            if label and label not in self.party_lookup and label not in self.abbrev_lookup
+        )
+
+        # Continuations only make sense within a sitting
+        speaker_affiliation_cache = SlidingAffiliationCache(max_age=4)
+        resolved = []
+        for raw_speaker, annotation, content in speeches:
+            norm_speaker = normalize(raw_speaker)
+            from_tribune = not annotation or "от място" not in annotation
+            is_continuation = False
+            speaker = None
+            target = None  # (affiliation_id, fallback_name)
+
+            # --- Party resolution ---
+            party = self._party_for(party_label(annotation))
+
+            # --- Speaker resolution ---
+            speaker_name = norm_speaker
+            if not resolver.candidates(speaker_name):
+                speaker_name = self.speaker_matcher.match(norm_speaker)
+
+            if speaker_name:
+                speaker = resolver.resolve_speaker(speaker_name, party.party_id if party else None, speech_date)
+
+            # --- Affiliation logic ---
+            if not annotation and norm_speaker in speaker_affiliation_cache:
+                target = speaker_affiliation_cache.get(norm_speaker)
+                is_continuation = True
+
+            affiliation = None
+            if not target and speaker and party:
+                affiliation = resolver.affiliation_for(speaker.speaker_id, party.party_id)
+
+            if not target and not affiliation:
+                for sid, pid in special_roles_for(norm_speaker):
+                    affiliation = resolver.affiliation_for(sid, pid)
+                    if affiliation:
+                        break
+
+            if not target and not affiliation and speaker:
+                affiliation = resolver.affiliation_on(speaker.speaker_id, speech_date)
+
+            if not target:
+                if affiliation:
+                    target = (affiliation.affiliation_id, None)
+                else:
+                    target = (None, raw_speaker.strip().title())
+
+            speaker_affiliation_cache.add(norm_speaker, target)
+            resolved.append(ResolvedSpeech(content, from_tribune, is_continuation, *target))
+
+        self.last_stats = ResolveStats(
+            parse_seconds=parse_seconds,
+            resolve_seconds=time.perf_counter() - started,
+            fuzzy={
+                name: (m.matched - before[name][0], m.unmatched - before[name][1]) for name, m in matchers.items()
+            },
+            cache_hits=speaker_affiliation_cache.hits,
+            cache_misses=speaker_affiliation_cache.misses,
+        )
+        return resolved
+
+
+# --- Process pool mode ---
+
+_worker_resolver: Optional[SittingResolver] = None
+
+def _init_worker(parties: List[PartySnapshot], affiliations: List[AffiliationSnapshot]):
+    global _worker_resolver
+    # The pool already uses every core, so keep cdist single-threaded
+    _worker_resolver = SittingResolver(parties, affiliations, fuzzy_workers=1)
+
+def _resolve_task(seating: dict, steno_text: str) -> Tuple[List[ResolvedSpeech], ResolveStats]:
+    speeches = _worker_resolver.resolve(steno_text, date.fromisoformat(seating["t_date"]))
+    return speeches, _worker_resolver.last_stats
+
+
+def resolve_in_pool(
+    fetched: Iterable[Tuple[dict, str]],
+    parties: List[PartySnapshot],
+    affiliations: List[AffiliationSnapshot],
+    processes: int,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[dict, List[ResolvedSpeech]]]:
+    """
+    Resolve sittings on a process pool and yield them back in input order.
+    At most `max_pending` sittings are queued so downloads cannot run far ahead.
+    """
+    max_pending = max_pending or processes * 2
+    fetched = iter(fetched)
+    pending = deque()
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        # The fetcher's download threads are already running; don't fork them
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(parties, affiliations),
+    ) as pool:
+        def submit_next() -> bool:
+            item = next(fetched, None)
+            if item is None:
+                return False
+            seating, steno_text = item
+            pending.append((seating, pool.submit(_resolve_task, seating, steno_text)))
+            return True
+
+        try:
+            for _ in range(max_pending):
+                if not submit_next():
+                    break
+            while pending:
+                seating, future = pending.popleft()
+                try:
+                    speeches, stats = future.result()
+                except Exception as e:
+                    raise SittingResolutionError(f"Failed to resolve sitting {seating['t_id']}: {e}", seating) from e
+                observe_resolution(stats)
+                submit_next()
+                yield seating, speeches
+        finally:
+            for _, future in pending:
+                future.cancel()
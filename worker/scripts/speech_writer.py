@@ -0,0 +1,136 @@
+from sqlalchemy import select, Table
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from models import Speech, Speaker, Party, SpeakerPartyAffiliation, Sitting, speech_fingerprint
+from speech_resolution import FALLBACK_PARTY_ID, FALLBACK_PARTY_NAME
+from datetime import date
+from typing import Optional, Tuple
+
+# Keeps each INSERT well below Postgres' 65535 bind-parameter limit
+INSERT_CHUNK_SIZE = 1000
+
+
+class BulkSpeechWriter:
+    """
+    Buffers parsed speeches for a sitting and writes them with one multi-row
+    INSERT ... ON CONFLICT DO NOTHING instead of a lookup and flush per speech.
+    Duplicates are rejected by the (datestamp, affiliation_id, content_hash)
+    unique constraint. `table` may be any table with the speeches layout,
+    e.g. the staging table used by rebuild_speeches; only writes to the live
+    table record their dates in `sittings`.
+    """
+
+    def __init__(self, db: Session, table: Optional[Table] = None):
+        self.db = db
+        self.table = table if table is not None else Speech.__table__
+        self._rows: list[dict] = []
+        self.inserted = 0
+        self.skipped = 0
+
+    def add(
+        self,
+        speech_content: str,
+        datestamp: date,
+        affiliation_id: int,
+        from_tribune: bool = True,
+        is_continuation: bool = False,
+    ) -> dict:
+        row = {
+            "speech_content": speech_content,
+            "datestamp": datestamp,
+            "affiliation_id": affiliation_id,
+            "from_tribune": from_tribune,
+            "is_continuation": is_continuation,
+            "processed": False,
+        }
+        self._rows.append(row)
+        return row
+
+    def flush(self) -> Tuple[int, int]:
+        """
+        Write the buffered rows and return (inserted, skipped) for this batch.
+        """
+        rows, self._rows = self._rows, []
+        if not rows:
+            return 0, 0
+
+        for row in rows:
+            row["content_hash"] = speech_fingerprint(row["speech_content"])
+
+        inserted = 0
+        for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+            stmt = insert(self.table).values(rows[i:i + INSERT_CHUNK_SIZE]).on_conflict_do_nothing(
+                index_elements=["datestamp", "affiliation_id", "content_hash"]
+            )
+            inserted += len(self.db.execute(stmt.returning(self.table.c.content_hash)).all())
+
+        if inserted and self.table is Speech.__table__:
+            self.db.execute(
+                insert(Sitting).values([{"sitting_date": d} for d in {row["datestamp"] for row in rows}])
+                .on_conflict_do_nothing()
+            )
+
+        skipped = len(rows) - inserted
+        self.inserted += inserted
+        self.skipped += skipped
+        return inserted, skipped
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class FallbackAffiliations:
+    """
+    Get-or-create the ВЪНШЕН affiliation for speakers missing from the roster.
+
+    Only the writer calls this, so resolution can stay read-only (and run in
+    other processes); the ON CONFLICT inserts also keep concurrent runs safe.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._ids: dict[str, int] = {}
+        self._party_ready = False
+
+    def _ensure_party(self):
+        if self._party_ready:
+            return
+        self.db.execute(
+            insert(Party)
+            .values(party_id=FALLBACK_PARTY_ID, party_name=FALLBACK_PARTY_NAME, party_abbreviation="")
+            .on_conflict_do_nothing()
+        )
+        self._party_ready = True
+
+    def _speaker_id(self, speaker_name: str) -> int:
+        lookup = select(Speaker.speaker_id).where(Speaker.speaker_name == speaker_name).order_by(Speaker.speaker_id).limit(1)
+        speaker_id = self.db.execute(lookup).scalar()
+        if speaker_id is None:
+            self.db.execute(
+                insert(Speaker)
+                .values(speaker_name=speaker_name, first_name="", middle_name="", last_name="")
+                .on_conflict_do_nothing(constraint="uq_full_speaker_name")
+            )
+            speaker_id = self.db.execute(lookup).scalar_one()
+        return speaker_id
+
+    def affiliation_id_for(self, speaker_name: str) -> int:
+        if speaker_name in self._ids:
+            return self._ids[speaker_name]
+
+        self._ensure_party()
+        speaker_id = self._speaker_id(speaker_name)
+        self.db.execute(
+            insert(SpeakerPartyAffiliation)
+            .values(speaker_speaker_id=speaker_id, party_party_id=FALLBACK_PARTY_ID, start_date=None, end_date=None)
+            .on_conflict_do_nothing(constraint="uq_speaker_party")
+        )
+        affiliation_id = self.db.execute(
+            select(SpeakerPartyAffiliation.affiliation_id).where(
+                SpeakerPartyAffiliation.speaker_speaker_id == speaker_id,
+                SpeakerPartyAffiliation.party_party_id == FALLBACK_PARTY_ID,
+            )
+        ).scalar_one()
+        print(f"➕ Fallback affiliation: {speaker_name} → {FALLBACK_PARTY_NAME}")
+        self._ids[speaker_name] = affiliation_id
+        return affiliation_id
@@ -0,0 +1,107 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Tuple
+import threading
+import time
+import requests
+from api_archive import ApiArchive, ArchiveMiss
+from http_client import API_BASE_URL
+
+
+class StenogramFetchError(RuntimeError):
+    def __init__(self, message: str, seating: Optional[dict] = None):
+        super().__init__(message)
+        self.seating = seating
+
+
+def order_seatings(seatings: dict[int, dict[int, list[dict]]]) -> list[dict]:
+    """
+    Flatten the {year: {month: [seating]}} grid into one list in sitting-date order.
+    """
+    flat = (s for year_data in seatings.values() for month_data in year_data.values() for s in month_data)
+    return sorted(flat, key=lambda s: (s["t_date"], s["t_id"]))
+
+
+class StenogramFetcher:
+    """
+    Downloads `pl-sten/{t_id}` records on a thread pool with at most `max_in_flight`
+    requests outstanding and hands them back in the order they were requested.
+    Retries, timeouts and rate limits are left to the archive's ParliamentClient.
+    """
+
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        max_in_flight: int = 8,
+        archive: Optional[ApiArchive] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.archive = archive or ApiArchive()
+        self.max_in_flight = max(1, max_in_flight)
+        self.records = 0
+        self.archived = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def fetch_one(self, t_id: int) -> str:
+        url = f"{self.base_url}/pl-sten/{t_id}"
+        try:
+            # Stenograms never change once published, so archived copies are served as-is
+            response = self.archive.get("pl-sten", t_id, url)
+            with self._lock:
+                if response.from_archive:
+                    self.archived += 1
+                else:
+                    self.bytes += len(response.body)
+            return response.json().get("Pl_Sten_body", "")
+        except ArchiveMiss as e:
+            raise StenogramFetchError(str(e)) from e
+        except requests.RequestException as e:
+            raise StenogramFetchError(f"Failed to fetch stenographic record {t_id}: {e}") from e
+        except ValueError as e:
+            raise StenogramFetchError(f"Invalid JSON for stenographic record {t_id}: {e}") from e
+
+    def fetch_all(self, seatings: Iterable[dict]) -> Iterator[Tuple[dict, str]]:
+        """
+        Yield (seating, Pl_Sten_body) pairs in input order while the next
+        records are still downloading in the background.
+        """
+        seatings = iter(seatings)
+        pending = deque()
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="pl-sten")
+
+        def submit_next() -> bool:
+            seating = next(seatings, None)
+            if seating is None:
+                return False
+            pending.append((seating, executor.submit(self.fetch_one, seating["t_id"])))
+            return True
+
+        try:
+            for _ in range(self.max_in_flight):
+                if not submit_next():
+                    break
+            while pending:
+                seating, future = pending.popleft()
+                try:
+                    steno_text = future.result()
+                except StenogramFetchError as e:
+                    e.seating = seating
+                    raise
+                self.records += 1
+                submit_next()
+                yield seating, steno_text
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.elapsed += time.perf_counter() - started
+            print(f"📈 Fetched {self.records} stenograms ({self.archived} from archive, "
+                  f"{self.bytes / 1024:.0f} KiB downloaded) in {self.elapsed:.1f}s – "
+                  f"{self.records_per_second:.2f} records/s")
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed else 0.0
@@ -0,0 +1,95 @@
+from typing import Iterator, NamedTuple, Optional
+from helpers import normalize
+import re
+
+# Speaker label at the start of a line: "ИМЕ ФАМИЛИЯ (ПАРТИЯ, от място): text..."
+# A single optional annotation group matches the same lines as the old `(\(.*\))*`
+# without its exponential backtracking on lines full of parentheses.
+SPEAKER_LINE = re.compile(r"([А-Я\s]+)(\(.*\))?:(.*)")
+BR_TAG = re.compile(r"<br\s*/?>", re.IGNORECASE)
+NEWLINES = re.compile(r"\n+")
+
+# Lowercased and normalized non-speaker labels (full or prefix-based)
+NON_SPEAKER_PREFIXES = [
+    "реплика", "реплики", "декларира", "декларация", "първо гласуване на", "второ гласуване на", "трето гласуване на",
+    "запазване на", "европа в света", "изказвания", "изказване", "гласуване", "отговори", "въпроси", "физическите лица"
+]
+
+
+class ParsedTurn(NamedTuple):
+    raw_speaker: str
+    annotation: str
+    content: str
+
+
+def is_likely_not_speaker(name: str) -> bool:
+    norm = normalize(name)
+    # Skip if it's too short and not a valid role
+    if len(norm.split()) == 1 and norm not in {"председател", "министър", "докладчик"}:
+        return True
+    # Skip if name starts with known invalid prefix
+    return any(norm.startswith(prefix) for prefix in NON_SPEAKER_PREFIXES)
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _clean(lines: list[str]) -> str:
+    content = BR_TAG.sub("\n", "\n".join(lines))
+    return NEWLINES.sub("\n", content).strip()
+
+
+def _close(turn: tuple, pending: Optional[tuple]):
+    """
+    Finish `turn`. Non-speaker labels are folded into the pending turn,
+    a real speaker releases the pending one and takes its place.
+    """
+    raw_speaker, annotation, lines = turn
+    content = _clean(lines)
+    if is_likely_not_speaker(raw_speaker):
+        if pending and content:
+            pending[2].append(content)
+        return pending
+    if pending:
+        yield _merged(pending)
+    return raw_speaker, annotation, [content]
+
+
+def _merged(turn: tuple) -> ParsedTurn:
+    raw_speaker, annotation, chunks = turn
+    return ParsedTurn(raw_speaker, annotation, "\n".join(chunks))
+
+
+def parse_stenogram(steno_text: str) -> Iterator[ParsedTurn]:
+    """
+    Scan a `Pl_Sten_body` line by line and yield one ParsedTurn per speaker turn.
+
+    Text under non-speaker labels (votes, replies, declarations...) is merged
+    into the preceding turn before it is yielded, so callers never patch a
+    turn after the fact. Text before the first speaker label is dropped.
+    """
+    current = None  # turn being read: (raw_speaker, annotation, [raw lines])
+    pending = None  # finished turn held back for continuations: (raw_speaker, annotation, [chunks])
+
+    for line in _iter_lines(steno_text or ""):
+        match = SPEAKER_LINE.match(line)
+        if not match:
+            if current:
+                current[2].append(line)
+            continue
+        if current:
+            pending = yield from _close(current, pending)
+        current = (match.group(1), match.group(2) or "", [match.group(3)])
+
+    if current:
+        pending = yield from _close(current, pending)
+    if pending:
+        yield _merged(pending)
@@ -1,11 +1,167 @@
-from db import SessionLocal
-from models import Speaker
+"""
+Ingestion daemon: keeps parties, speakers and speeches in sync with parliament.bg.
 
-db = SessionLocal()
+    python worker.py                 # run the schedule until stopped
+    python worker.py --once ingest   # run one job now and exit
 
-speakers = db.query(Speaker).all()
-print(f"✅ Found {len(speakers)} speakers in the DB.")
-for speaker in speakers:
-    print(f"- {speaker.speaker_name}")
+Every job runs under the pipeline advisory lock, so a second worker, a manual
+seed_speeches.py or a rebuild never overlaps it. A job that finds the lock taken
+is retried after WORKER_LOCK_RETRY seconds instead of waiting on it. Runs are
+recorded in worker_runs and served by the API at /worker/runs.
+"""
+import os
+import sys
 
-db.close()
\ No newline at end of file
+# The scripts import each other by module name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Callable, Optional
+import argparse
+import signal
+import threading
+import time
+import traceback
+
+from db import SessionLocal, init_db
+from models import SpeakerPartyAffiliation
+from roster_sync import sync_roster, months_between
+from seed_init_speakers import START_DATE
+from seed_speeches import ingest_new_sittings
+from process_speeches import process_speeches
+from stenogram_fetcher import StenogramFetcher
+from pipeline_lock import pipeline_lock
+from run_history import start_run, finish_run, abandon_stale_runs, last_successes
+from pipeline_metrics import JOB_SECONDS, start_metrics_server
+
+# Sittings are published during the day; a short poll keeps the API close behind.
+# Unchanged archive months come back as 304s, so an idle poll costs a few requests.
+INGEST_INTERVAL = float(os.getenv("WORKER_INGEST_INTERVAL", "600"))
+ROSTER_INTERVAL = float(os.getenv("WORKER_ROSTER_INTERVAL", "21600"))
+PROCESS_INTERVAL = float(os.getenv("WORKER_PROCESS_INTERVAL", "600"))
+LOCK_RETRY = float(os.getenv("WORKER_LOCK_RETRY", "60"))
+
+
+def sync_roster_job() -> Optional[int]:
+    """Parties and the memberships of the months that can still change; the whole term on an empty database."""
+    today = date.today()
+    db = SessionLocal()
+    try:
+        empty = db.query(SpeakerPartyAffiliation.affiliation_id).first() is None
+    finally:
+        db.close()
+    start = START_DATE if empty else date(today.year - (today.month == 1), (today.month - 2) % 12 + 1, 1)
+    if not sync_roster(months_between(start, today), parties=True, fallback_roles=True):
+        raise RuntimeError("roster sync was rolled back")
+    return None
+
+
+def ingest_job() -> Optional[int]:
+    fetcher = StenogramFetcher(max_in_flight=int(os.getenv("STENOGRAM_MAX_IN_FLIGHT", "8")))
+    return ingest_new_sittings(fetcher, processes=int(os.getenv("INGEST_PROCESSES", "1")))
+
+
+def process_job() -> Optional[int]:
+    return process_speeches(
+        batch_size=int(os.getenv("PROCESS_BATCH_SIZE", "500")),
+        processes=int(os.getenv("PROCESS_PROCESSES", "1")),
+    )
+
+
+@dataclass
+class Job:
+    name: str
+    run: Callable[[], Optional[int]]
+    interval: float
+    next_due: float = 0.0
+
+
+# In dependency order: speeches are resolved against the roster, then processed
+JOBS = {
+    "roster": Job("roster", sync_roster_job, ROSTER_INTERVAL),
+    "ingest": Job("ingest", ingest_job, INGEST_INTERVAL),
+    "process": Job("process", process_job, PROCESS_INTERVAL),
+}
+
+
+def run_job(job: Job) -> str:
+    """Run one job under the pipeline lock; returns success, failed or skipped (lock taken)."""
+    with pipeline_lock() as acquired:
+        if not acquired:
+            print(f"⚠️ {job.name}: pipeline lock is held elsewhere, retrying in {LOCK_RETRY:.0f}s")
+            return "skipped"
+        db = SessionLocal()
+        try:
+            stale = abandon_stale_runs(db)
+        finally:
+            db.close()
+        if stale:
+            print(f"ℹ️ Marked {stale} interrupted runs as failed")
+
+        run_id = start_run(job.name)
+        started = time.perf_counter()
+        try:
+            rows = job.run()
+        except Exception as e:
+            traceback.print_exc()
+            finish_run(run_id, "failed", error=str(e))
+            JOB_SECONDS.labels(job.name, "failed").observe(time.perf_counter() - started)
+            print(f"❌ {job.name} failed after {time.perf_counter() - started:.1f}s: {e}")
+            return "failed"
+        finish_run(run_id, "success", rows=rows)
+        JOB_SECONDS.labels(job.name, "success").observe(time.perf_counter() - started)
+        print(f"✅ {job.name} done in {time.perf_counter() - started:.1f}s")
+        return "success"
+
+
+def schedule_from_history(jobs: list[Job]):
+    """After a restart, continue each job's interval from its last success rather than running everything at once."""
+    db = SessionLocal()
+    try:
+        successes = last_successes(db)
+    finally:
+        db.close()
+    now = time.monotonic()
+    for job in jobs:
+        last = successes.get(job.name)
+        since = (datetime.now(timezone.utc) - last).total_seconds() if last else job.interval
+        job.next_due = now + max(0.0, job.interval - since)
+
+
+def serve(jobs: list[Job], stop: threading.Event):
+    schedule_from_history(jobs)
+    print("🔁 Worker started: " + ", ".join(f"{j.name} every {j.interval:.0f}s" for j in jobs))
+    while not stop.is_set():
+        for job in jobs:
+            if stop.is_set():
+                break
+            if job.next_due <= time.monotonic():
+                status = run_job(job)
+                job.next_due = time.monotonic() + (LOCK_RETRY if status == "skipped" else job.interval)
+        stop.wait(max(1.0, min(j.next_due for j in jobs) - time.monotonic()))
+    print("ℹ️ Worker stopped.")
+
+
+def migrate():
+    # Only one worker applies migrations; the others find the schema already at head
+    with pipeline_lock() as acquired:
+        if acquired:
+            init_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scheduled roster sync and speech ingestion.")
+    parser.add_argument("--once", choices=list(JOBS), help="run one job now and exit")
+    args = parser.parse_args()
+
+    migrate()
+    if args.once:
+        sys.exit(0 if run_job(JOBS[args.once]) == "success" else 1)
+
+    stop = threading.Event()
+    # Let the current job finish; its sittings are committed one by one anyway
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    start_metrics_server()
+    serve(list(JOBS.values()), stop)